@@ -0,0 +1,394 @@
+"""Offline benchmark harness.
+
+Runs each benchmark case in a fresh process against synthetic data, records
+latency percentiles, throughput and peak RSS to a JSON baseline, and compares
+two baselines to flag regressions.
+
+    PYTHONPATH=. python -m benchmarks.bench run --output bench.json
+    PYTHONPATH=. python -m benchmarks.bench compare baseline.json bench.json
+    PYTHONPATH=. python -m benchmarks.bench backends --model all-MiniLM-L6-v2
+"""
+
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+import typer
+
+from benchmarks.synthetic import ENV_DEFAULTS
+
+app = typer.Typer(help="Benchmarks for the embedding, search, ticket and LP paths.")
+
+DEFAULT_SIZES: dict[str, list[int]] = {
+    "embed_data": [100, 1000],
+    "similarity_search": [1000, 10000],
+    "hybrid_search": [1000, 10000],
+    "rerank_search": [1000, 10000],
+    "skills_sql": [1000, 10000],
+    "ticket_synthesis": [50, 200],
+    "optimization": [10, 20],
+}
+
+
+def _setup_embed_data(size: int, options: dict) -> tuple[Callable[[], None], int]:
+    from benchmarks.synthetic import HashingEncoder, onet_data
+    from src.embeddings import embed_data
+
+    if options["model"] == "stub":
+        embed_data.load_model = HashingEncoder  # type: ignore
+    pipeline = embed_data.EmbedsPipeline(options["model"], backend=options["backend"])
+    data = onet_data(size)
+    return lambda: pipeline.embed_data(data, "titles"), size
+
+
+def _similarity_query(
+    size: int, query_file: str, params: dict | None = None
+) -> tuple[Callable[[], None], int]:
+    import duckdb
+    from polars import DataFrame
+
+    from benchmarks.synthetic import embeddings_table
+
+    quack = duckdb.connect()
+    table = embeddings_table(size)
+    quack.register("table_data", table)
+    quack.execute("CREATE TABLE onet_with_embeddings AS SELECT * FROM table_data")
+    query = (Path("src/sql") / query_file).read_text()
+    job = DataFrame(
+        {
+            "jobtitle": ["software engineer"],
+            "jobtitle_embeddings": [table.get_column("TITLE_EMBEDDINGS")[0].to_list()],
+        }
+    )
+    quack.register("j_embeds", job)
+    return lambda: quack.execute(query, params).fetch_arrow_table(), size
+
+
+def _setup_similarity_search(
+    size: int, options: dict
+) -> tuple[Callable[[], None], int]:
+    return _similarity_query(size, "similar_jobs.sql")
+
+
+def _setup_hybrid_search(size: int, options: dict) -> tuple[Callable[[], None], int]:
+    return _similarity_query(size, "similar_jobs_fused.sql")
+
+
+def _setup_rerank_search(size: int, options: dict) -> tuple[Callable[[], None], int]:
+    return _similarity_query(
+        size,
+        "similar_jobs_rerank.sql",
+        {"candidates": 50, "title_weight": 0.5, "description_weight": 0.5},
+    )
+
+
+def _setup_skills_sql(size: int, options: dict) -> tuple[Callable[[], None], int]:
+    import duckdb
+
+    from benchmarks.synthetic import onet_data, write_dwa_files
+
+    codes = onet_data(size).get_column("onetsoc_code").to_list()
+    query = Path("src/sql/get_skills_by_onet.sql").resolve().read_text()
+    directory = Path(tempfile.mkdtemp())
+    write_dwa_files(directory, codes)
+    os.chdir(directory)
+    quack = duckdb.connect()
+    params = {"ONET_CODE": codes[:5]}
+    return lambda: quack.execute(query, params).fetch_arrow_table(), size
+
+
+def _setup_ticket_synthesis(size: int, options: dict) -> tuple[Callable[[], None], int]:
+    from benchmarks.synthetic import FakeLLMClient
+    from src.org_structure.org_model import OrgLevel, OrgModel
+    from src.ticketing import ticketing_page
+
+    client = FakeLLMClient(options["llm_latency"])
+    ticketing_page.get_client = lambda: client  # type: ignore
+    org = OrgModel.generate(
+        [OrgLevel(designations=["Employee"], min_reports=size, max_reports=size)],
+        seed=0,
+    )
+    root = org.root()
+    return (
+        lambda: asyncio.run(ticketing_page.generate_tickets_for_organization(root)),
+        size,
+    )
+
+
+def _setup_optimization(size: int, options: dict) -> tuple[Callable[[], None], int]:
+    from benchmarks.synthetic import tickets_frame
+    from src.optimization.optimization_page import optimize_team_composition
+
+    tickets = tickets_frame(size)
+    constraints = {"max_tickets_per_employee": 5} | {
+        f"min_{dept}_tickets": 0 for dept in ["Technology", "Operations", "Finance"]
+    }
+    return lambda: optimize_team_composition(tickets, constraints), size
+
+
+CASES: dict[str, Callable[[int, dict], tuple[Callable[[], None], int]]] = {
+    "embed_data": _setup_embed_data,
+    "similarity_search": _setup_similarity_search,
+    "hybrid_search": _setup_hybrid_search,
+    "rerank_search": _setup_rerank_search,
+    "skills_sql": _setup_skills_sql,
+    "ticket_synthesis": _setup_ticket_synthesis,
+    "optimization": _setup_optimization,
+}
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _run_case(case: str, size: int, repeat: int, warmup: int, options: dict) -> dict:
+    for key, value in ENV_DEFAULTS.items():
+        os.environ.setdefault(key, value)
+
+    run, items = CASES[case](size, options)
+    for _ in range(warmup):
+        run()
+
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        latencies.append(time.perf_counter() - start)
+
+    values = np.array(latencies)
+    return {
+        "case": case,
+        "size": size,
+        "repeat": repeat,
+        "mean_s": float(values.mean()),
+        "p50_s": float(np.percentile(values, 50)),
+        "p95_s": float(np.percentile(values, 95)),
+        "throughput_per_s": items / float(np.median(values)),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@app.command()
+def run(
+    output: Path = typer.Option(Path("bench.json"), help="Where to write results"),
+    case: list[str] = typer.Option(list(CASES), help="Cases to run"),
+    sizes: str = typer.Option("", help="Comma-separated sizes overriding defaults"),
+    repeat: int = typer.Option(5, help="Timed repetitions per case and size"),
+    warmup: int = typer.Option(1, help="Untimed repetitions before timing"),
+    model: str = typer.Option("stub", help="Embedding model, or 'stub'"),
+    backend: str = typer.Option("torch", help="Inference backend of the model"),
+    llm_latency: float = typer.Option(0.0, help="Fake LLM latency per call (s)"),
+) -> None:
+    """Run the benchmarks and write a JSON baseline."""
+    options = {"model": model, "backend": backend, "llm_latency": llm_latency}
+    results = []
+    for name in case:
+        if name not in CASES:
+            raise typer.BadParameter(
+                f"Unknown case '{name}', expected one of {list(CASES)}"
+            )
+        case_sizes = (
+            [int(size) for size in sizes.split(",")] if sizes else DEFAULT_SIZES[name]
+        )
+        for size in case_sizes:
+            typer.echo(f"{name} size={size} ...", nl=False)
+            # A fresh process per case keeps peak RSS and imports independent
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                result = pool.submit(
+                    _run_case, name, size, repeat, warmup, options
+                ).result()
+            typer.echo(
+                f" p50={result['p50_s']:.4f}s p95={result['p95_s']:.4f}s "
+                f"throughput={result['throughput_per_s']:.1f}/s "
+                f"rss={result['peak_rss_mb']:.0f}MiB"
+            )
+            results.append(result)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": options,
+        },
+        "results": results,
+    }
+    output.write_text(json.dumps(report, indent=2))
+    typer.echo(f"Results written to {output}")
+
+
+@app.command()
+def compare(
+    baseline: Path = typer.Argument(..., help="Earlier results"),
+    current: Path = typer.Argument(..., help="New results"),
+    threshold: float = typer.Option(0.10, help="Relative slowdown flagged"),
+) -> None:
+    """Compare two result files and exit non-zero on regressions."""
+    before = {
+        (row["case"], row["size"]): row
+        for row in json.loads(baseline.read_text())["results"]
+    }
+    regressions = 0
+    for row in json.loads(current.read_text())["results"]:
+        old = before.get((row["case"], row["size"]))
+        if old is None:
+            typer.echo(f"{row['case']} size={row['size']}: no baseline")
+            continue
+        p50_change = row["p50_s"] / old["p50_s"] - 1
+        rss_change = row["peak_rss_mb"] / old["peak_rss_mb"] - 1
+        regressed = p50_change > threshold or rss_change > threshold
+        regressions += regressed
+        typer.echo(
+            f"{'REGRESSION' if regressed else 'ok':>10}  {row['case']} "
+            f"size={row['size']}: p50 {p50_change:+.1%}, "
+            f"throughput {row['throughput_per_s'] / old['throughput_per_s'] - 1:+.1%}, "
+            f"peak RSS {rss_change:+.1%}"
+        )
+    if regressions:
+        typer.echo(f"{regressions} regression(s) above {threshold:.0%}")
+        raise typer.Exit(code=1)
+
+
+def _embed_with_backend(
+    model: str,
+    backend: str,
+    titles: list[str],
+    descriptions: list[str],
+    repeat: int,
+    warmup: int,
+) -> dict:
+    from polars import DataFrame
+
+    from src.embeddings.embed_data import EmbedsPipeline, load_model
+
+    for key, value in ENV_DEFAULTS.items():
+        os.environ.setdefault(key, value)
+
+    # The first load converts and caches the model, later loads read the cache
+    start = time.perf_counter()
+    load_model(model, backend)
+    load_s = time.perf_counter() - start
+
+    pipeline = EmbedsPipeline(model, backend=backend)
+    data = DataFrame({"titles": titles, "descriptions": descriptions})
+    embeddings, latencies = {}, []
+    for index in range(warmup + repeat):
+        start = time.perf_counter()
+        for column in ["titles", "descriptions"]:
+            embeddings[column] = np.asarray(
+                pipeline.embed_data(data, column)
+                .get_column(f"{column}_embeddings")
+                .to_list()
+            )
+        if index >= warmup:
+            latencies.append(time.perf_counter() - start)
+
+    return {
+        "backend": backend,
+        "load_s": load_s,
+        "p50_s": float(np.median(latencies)),
+        "texts_per_s": 2 * len(data) / float(np.median(latencies)),
+        "peak_rss_mb": _peak_rss_mb(),
+        "embeddings": embeddings,
+    }
+
+
+@app.command()
+def backends(
+    model: str = typer.Option("all-MiniLM-L6-v2", help="Embedding model"),
+    backend: list[str] = typer.Option(["int8", "onnx"], help="Compared to torch"),
+    size: int = typer.Option(1000, help="Synthetic occupations embedded"),
+    data: Path = typer.Option(
+        None,
+        help="Parquet file or glob of O*NET occupations to embed instead, "
+        "e.g. the parts written by `src.cli embed`",
+    ),
+    repeat: int = typer.Option(3, help="Timed repetitions per backend"),
+    warmup: int = typer.Option(1, help="Untimed repetitions before timing"),
+    output: Path = typer.Option(Path("bench_backends.json"), help="Results file"),
+) -> None:
+    """Compare the texts/sec and accuracy of inference backends to fp32 torch."""
+    from polars import read_parquet
+
+    from benchmarks.synthetic import onet_data
+    from src.embeddings.backends import BACKENDS, similarity_agreement
+
+    for name in backend:
+        if name not in BACKENDS:
+            raise typer.BadParameter(f"Unknown backend '{name}', expected {BACKENDS}")
+    occupations = onet_data(size) if data is None else read_parquet(str(data))
+    titles = occupations.get_column("titles").to_list()
+    descriptions = occupations.get_column("descriptions").to_list()
+
+    results = []
+    for name in ["torch", *[name for name in backend if name != "torch"]]:
+        typer.echo(f"{name} ...", nl=False)
+        # A fresh process per backend keeps peak RSS and thread pools independent
+        with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+            result = pool.submit(
+                _embed_with_backend,
+                model,
+                name,
+                titles,
+                descriptions,
+                repeat,
+                warmup,
+            ).result()
+        embeddings = result.pop("embeddings")
+        if name == "torch":
+            reference, baseline = embeddings, result["texts_per_s"]
+        result["speedup"] = result["texts_per_s"] / baseline
+        result["accuracy"] = {
+            column: similarity_agreement(reference[column], embeddings[column])
+            for column in embeddings
+        }
+        typer.echo(
+            f" {result['texts_per_s']:.1f} texts/s ({result['speedup']:.2f}x) "
+            f"load={result['load_s']:.1f}s rss={result['peak_rss_mb']:.0f}MiB "
+            + " ".join(
+                f"{column}: min cosine {agreement['min_cosine']:.4f}, "
+                f"top-k overlap {agreement['topk_overlap']:.1%}"
+                for column, agreement in result["accuracy"].items()
+            )
+        )
+        results.append(result)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": {"model": model, "texts": 2 * len(occupations)},
+        },
+        "results": results,
+    }
+    output.write_text(json.dumps(report, indent=2))
+    typer.echo(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    app()
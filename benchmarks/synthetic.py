@@ -0,0 +1,185 @@
+"""Synthetic data and fake backends for offline benchmarks.
+
+Nothing here touches the network or the production databases: O*NET-like
+occupations are generated from a fixed vocabulary, embeddings come from a
+deterministic hashing encoder and ticket synthesis uses a fake LLM client.
+"""
+
+import asyncio
+import zlib
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from polars import DataFrame
+
+WORDS = (
+    "software data systems network security financial sales marketing "
+    "operations project product quality research clinical civil mechanical "
+    "electrical chemical logistics customer support human resources legal "
+    "analyst engineer manager specialist technician coordinator director "
+    "administrator consultant scientist designer developer architect officer"
+).split()
+
+ENV_DEFAULTS = {
+    "MODEL_VERSION": "stub",
+    "ONET_QUERY": "src/sql/onet_jobs.sql",
+    "EMBEDS_QUERY": "src/sql/embed_data.sql",
+    "OPENAI_API_KEY": "benchmark",
+    "DUCKDB_PATH": ":memory:",
+    "PINECONE_API_KEY": "benchmark",
+    "AWS_ACCESS_KEY_ID": "benchmark",
+    "AWS_SECRET_ACCESS_KEY": "benchmark",
+    "AWS_REGION": "us-east-1",
+    "HST": "localhost",
+    "USR": "benchmark",
+    "DB": "benchmark",
+}
+
+
+def onet_data(size: int, seed: int = 0) -> DataFrame:
+    """O*NET-like occupations with the columns `onet_jobs.sql` returns."""
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS)
+    titles = [" ".join(row) for row in words[rng.integers(0, len(words), (size, 3))]]
+    descriptions = [
+        " ".join(row) for row in words[rng.integers(0, len(words), (size, 40))]
+    ]
+    codes = rng.choice(10**8, size=size, replace=False)
+    return DataFrame(
+        {
+            "onetsoc_code": [f"{code:08d}" for code in codes],
+            "titles": titles,
+            "descriptions": descriptions,
+            "median_salary": rng.integers(25_000, 250_000, size),
+            "index": np.arange(1, size + 1),
+        }
+    )
+
+
+class HashingEncoder:
+    """Deterministic stand-in for `SentenceTransformer` hashing words into a vector."""
+
+    def __init__(
+        self, model_version: str, backend: str = "torch", dim: int = 384
+    ) -> None:
+        """Initialize the encoder; `model_version` and `backend` are ignored."""
+        self.dim = dim
+
+    def encode(self, sentences: list[str], **kwargs) -> np.ndarray:  # type: ignore
+        """Embed sentences as L2-normalized bags of hashed words."""
+        vectors = np.zeros((len(sentences), self.dim), dtype=np.float32)
+        for row, sentence in enumerate(sentences):
+            for word in sentence.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % self.dim] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+def embeddings_table(size: int, dim: int = 384, seed: int = 0) -> DataFrame:
+    """Rows shaped like `onet_with_embeddings` with random unit embeddings."""
+    data = onet_data(size, seed)
+    rng = np.random.default_rng(seed)
+    titles, descriptions = rng.standard_normal((2, size, dim))
+    titles /= np.linalg.norm(titles, axis=1, keepdims=True)
+    descriptions /= np.linalg.norm(descriptions, axis=1, keepdims=True)
+    fused = 0.7 * titles + 0.3 * descriptions
+    fused /= np.linalg.norm(fused, axis=1, keepdims=True)
+    return DataFrame(
+        {
+            "ONET_INDEX": data.get_column("index"),
+            "ONET_TITLES": data.get_column("titles"),
+            "ONET_ONETSOC_CODE": data.get_column("onetsoc_code"),
+            "MEDIAN_SALARY": data.get_column("median_salary"),
+            "TITLE_EMBEDDINGS": titles.tolist(),
+            "DESCRIPTION_EMBEDDINGS": descriptions.tolist(),
+            "FUSED_EMBEDDINGS": fused.tolist(),
+            "TITLE_WEIGHT": 0.7,
+            "DESCRIPTION_WEIGHT": 0.3,
+            "INFERENCE_BACKEND": "torch",
+        }
+    )
+
+
+def write_dwa_files(directory: Path, codes: list[str], seed: int = 0) -> None:
+    """Write `data/dwas.txt` and `data/task_to_dwa.txt` for `get_skills_by_onet.sql`."""
+    rng = np.random.default_rng(seed)
+    data_dir = directory / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    n_dwas = max(len(codes) // 2, 10)
+    dwa_ids = [f"4.A.{i}" for i in range(n_dwas)]
+    words = np.array(WORDS)
+    DataFrame(
+        {
+            "DWA ID": dwa_ids,
+            "DWA Title": [
+                " ".join(row) for row in words[rng.integers(0, len(words), (n_dwas, 5))]
+            ],
+        }
+    ).write_csv(data_dir / "dwas.txt", separator="\t")
+
+    n_tasks = len(codes) * 10
+    DataFrame(
+        {
+            "O*NET-SOC Code": [
+                f"{code[:2]}-{code[2:6]}.{code[6:]}"
+                for code in rng.choice(codes, n_tasks)
+            ],
+            "Task ID": np.arange(n_tasks),
+            "DWA ID": rng.choice(dwa_ids, n_tasks),
+        }
+    ).write_csv(data_dir / "task_to_dwa.txt", separator="\t")
+
+
+def tickets_frame(size: int, seed: int = 0) -> DataFrame:
+    """Tickets shaped like the output of `generate_tickets_for_organization`."""
+    rng = np.random.default_rng(seed)
+    return DataFrame(
+        {
+            "ticket_priority": rng.choice(["low", "medium", "high"], size).tolist(),
+            "department": rng.choice(
+                ["Technology", "Operations", "Finance"], size
+            ).tolist(),
+            "index": np.arange(size),
+        }
+    )
+
+
+class FakeLLMClient:
+    """Drop-in for the instructor client returning canned tickets after a delay."""
+
+    def __init__(self, latency_s: float = 0.0) -> None:
+        """Initialize the client with a fixed per-call latency."""
+        self.latency_s = latency_s
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(
+                create_with_completion=self.create_with_completion
+            )
+        )
+
+    async def create_with_completion(self, response_model, messages, **kwargs):  # type: ignore
+        """Return a ticket built from the prompt and a fake usage record."""
+        await asyncio.sleep(self.latency_s)
+        prompt = messages[0]["content"]
+        ticket = response_model(
+            id="T0001",
+            parent_id="P0001",
+            collection_id="C0001",
+            type="Technical",
+            subject="Benchmark ticket",
+            description=" ".join(prompt.split()[:50]),
+            status="open",
+            priority="medium",
+            assignees=[{"id": "A0001", "username": "benchmark"}],
+            updated_at="2023-01-01T00:00:00.000Z",
+            created_at="2023-01-01T00:00:00.000Z",
+            created_by="benchmark",
+            due_date="2023-01-08T00:00:00.000Z",
+            completed_at="2023-01-09T00:00:00.000Z",
+            tags=[],
+        )
+        usage = SimpleNamespace(
+            prompt_tokens=len(prompt.split()), completion_tokens=len(ticket.description)
+        )
+        return ticket, SimpleNamespace(usage=usage)
@@ -0,0 +1,349 @@
+"""Headless batch CLI for the embedding, ticket and optimization pipelines.
+
+Each command writes its results in parts and skips the parts that already
+exist, so an interrupted run picks up where it stopped. The Streamlit pages
+read these precomputed outputs instead of recomputing them.
+
+    PYTHONPATH=. python -m src.cli embed --full --workers 4
+    PYTHONPATH=. python -m src.cli check-backend onnx --full
+    PYTHONPATH=. python -m src.cli org --num-managers 20 --max-employees 50
+    PYTHONPATH=. python -m src.cli tickets --num-managers 20 --max-employees 50
+    PYTHONPATH=. python -m src.cli optimize --num-managers 20 --max-employees 50
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import typer
+from polars import DataFrame, Float64, List, arange, concat, count, read_parquet
+
+from src.org_structure.org_model import OrgModel, OrgNode, default_levels
+from src.org_structure.org_store import OrgKey, org_path
+
+BATCH_DIR = Path(".cache/batch")
+
+EMBEDDING_COLUMNS = ("titles_embeddings", "descriptions_embeddings", "fused_embeddings")
+
+app = typer.Typer(help="Run the app's pipelines outside Streamlit.")
+
+
+def write_parquet(frame: DataFrame, path: Path) -> None:
+    """Write a frame so that `path` only ever holds a complete file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".partial")
+    frame.write_parquet(partial)
+    partial.replace(path)
+
+
+def write_duckdb(frame: DataFrame, database: Path, table: str) -> None:
+    """Replace a DuckDB table with the contents of a frame."""
+    import duckdb
+
+    with duckdb.connect(str(database)) as quack:
+        quack.register("frame", frame.to_arrow())
+        quack.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM frame")
+
+
+def load_org(key: OrgKey) -> OrgModel:
+    """Load the persisted org for a key, generating and persisting it if missing."""
+    path = org_path(key)
+    if path.exists():
+        return OrgModel.load(path)
+    num_managers, max_employees, seed = key
+    org = OrgModel.generate(default_levels(num_managers, max_employees), seed=seed)
+    org.save(path)
+    return org
+
+
+def _embed_chunk(
+    model_version: str, backend: str, titles: list[str], descriptions: list[str]
+) -> dict[str, list]:
+    from src.embeddings.embed_data import EmbedsPipeline
+
+    embeds = EmbedsPipeline(model_version, backend=backend).embed_onet_data(
+        DataFrame({"titles": titles, "descriptions": descriptions})
+    )
+    # Plain lists travel back to the parent; it rebuilds one row per occupation
+    return embeds.select(EMBEDDING_COLUMNS).to_dict(as_series=False)
+
+
+def check_embeddings(embedded: DataFrame) -> None:
+    """Check every occupation holds one float vector of the same width per column.
+
+    Raises:
+        ValueError: If an embedding column is not a list of floats or its
+            vectors differ in width.
+    """
+    widths = set()
+    for column in EMBEDDING_COLUMNS:
+        if embedded.schema[column] != List(Float64):
+            raise ValueError(
+                f"{column} is {embedded.schema[column]}, expected {List(Float64)}"
+            )
+        widths.update(embedded.get_column(column).list.len().unique().to_list())
+    if len(widths) > 1:
+        raise ValueError(f"Embedding widths differ across rows: {sorted(widths)}")
+
+
+@app.command()
+def embed(
+    model_version: str = typer.Option(
+        None, help="Embeddings model, MODEL_VERSION if not set"
+    ),
+    backend: str = typer.Option(
+        None, help="torch, int8 or onnx, INFERENCE_BACKEND if not set"
+    ),
+    sample: bool = typer.Option(True, "--sample/--full", help="Embed a 100 row sample"),
+    chunk_size: int = typer.Option(1000, help="Rows embedded and written per part"),
+    workers: int = typer.Option(1, help="Processes embedding chunks in parallel"),
+    output_dir: Path = typer.Option(BATCH_DIR / "embeddings", help="Parts directory"),
+) -> None:
+    """Embed the ONET occupations into the model version's embeddings table.
+
+    The table is `onet_embeddings__<model>`, see `src.embeddings.versions`.
+    """
+    from src.embeddings.embed_data import EmbedsPipeline
+    from src.schemas.settings import settings
+
+    model_version = model_version or settings.model.MODEL_VERSION
+    pipeline = EmbedsPipeline(model_version, backend=backend)
+    onet_data = pipeline.load_onet_data(sample)
+
+    # Parts are only reused by runs that would have written the same rows
+    parts_dir = (
+        output_dir
+        / model_version.replace("/", "__")
+        / pipeline.backend
+        / (
+            f"{'sample' if sample else 'full'}_chunk{chunk_size}"
+            f"_tw{pipeline.title_weight:g}_dw{pipeline.description_weight:g}"
+        )
+    )
+    chunks = {
+        parts_dir / f"part-{start // chunk_size:05d}.parquet": onet_data.slice(
+            start, chunk_size
+        )
+        for start in range(0, len(onet_data), chunk_size)
+    }
+    pending = {path: chunk for path, chunk in chunks.items() if not path.exists()}
+    typer.echo(f"{len(chunks) - len(pending)} of {len(chunks)} parts already embedded")
+
+    with typer.progressbar(length=len(pending), label="Embedding") as progress:
+        if workers > 1:
+            with ProcessPoolExecutor(workers, mp_context=get_context("spawn")) as pool:
+                futures = {
+                    pool.submit(
+                        _embed_chunk,
+                        model_version,
+                        pipeline.backend,
+                        chunk.get_column("titles").to_list(),
+                        chunk.get_column("descriptions").to_list(),
+                    ): path
+                    for path, chunk in pending.items()
+                }
+                for future in as_completed(futures):
+                    path = futures[future]
+                    embeds = DataFrame(future.result())
+                    write_parquet(
+                        concat([pending[path], embeds], how="horizontal"), path
+                    )
+                    progress.update(1)
+        else:
+            for path, chunk in pending.items():
+                write_parquet(pipeline.embed_onet_data(chunk), path)
+                progress.update(1)
+
+    embedded = concat([read_parquet(path) for path in chunks])
+    if len(embedded) != len(onet_data):
+        raise typer.BadParameter(
+            f"Parts in {parts_dir} hold {len(embedded)} rows but {len(onet_data)} "
+            "were loaded; delete them to re-embed"
+        )
+    try:
+        check_embeddings(embedded)
+    except ValueError as error:
+        raise typer.BadParameter(
+            f"Parts in {parts_dir} are malformed ({error}); delete them to re-embed"
+        ) from error
+    pipeline.save_embeddings(embedded)
+    typer.echo(f"Saved {len(embedded)} embedded occupations")
+
+
+@app.command("check-backend")
+def check_backend(
+    backend: str = typer.Argument(..., help="Backend checked, int8 or onnx"),
+    model_version: str = typer.Option(
+        None, help="Embeddings model, MODEL_VERSION if not set"
+    ),
+    sample: bool = typer.Option(True, "--sample/--full", help="Check a 100 row sample"),
+    min_cosine: float = typer.Option(
+        0.99, help="Lowest cosine similarity to the fp32 embedding accepted"
+    ),
+) -> None:
+    """Check a backend's ONET embeddings against the fp32 torch embeddings."""
+    from src.embeddings.backends import similarity_agreement
+    from src.embeddings.embed_data import EmbedsPipeline
+    from src.schemas.settings import settings
+
+    model_version = model_version or settings.model.MODEL_VERSION
+    reference = EmbedsPipeline(model_version, backend="torch")
+    candidate = EmbedsPipeline(model_version, backend=backend)
+    onet_data = reference.load_onet_data(sample)
+
+    failed = False
+    for column in ["titles", "descriptions"]:
+        fp32, converted = (
+            pipeline.embed_data(onet_data, column)
+            .get_column(f"{column}_embeddings")
+            .to_list()
+            for pipeline in (reference, candidate)
+        )
+        agreement = similarity_agreement(np.asarray(fp32), np.asarray(converted))
+        failed |= agreement["min_cosine"] < min_cosine
+        typer.echo(
+            f"{column}: "
+            + ", ".join(f"{name} {value:.4f}" for name, value in agreement.items())
+        )
+    if failed:
+        typer.echo(f"{backend} embeddings drift below cosine {min_cosine} of fp32")
+        raise typer.Exit(code=1)
+    typer.echo(f"{backend} embeddings agree with fp32")
+
+
+@app.command()
+def org(
+    num_managers: int = typer.Option(..., help="Number of managers"),
+    max_employees: int = typer.Option(..., help="Maximum employees per manager"),
+    seed: int = typer.Option(0, help="Generator seed"),
+    force: bool = typer.Option(False, help="Regenerate even if already saved"),
+) -> None:
+    """Generate an org and persist it where the Org Structure page loads it."""
+    key = (num_managers, max_employees, seed)
+    path = org_path(key)
+    if path.exists() and not force:
+        typer.echo(f"Org already saved at {path}")
+        return
+    org = OrgModel.generate(default_levels(num_managers, max_employees), seed=seed)
+    org.save(path)
+    typer.echo(f"Saved org of {len(org)} employees to {path}")
+
+
+async def _ticket_parts(
+    parts: dict[Path, list[OrgNode]], workers: int, progress: Any
+) -> None:
+    from src.ticketing.ticketing_page import (
+        close_client,
+        create_ticket_with_prompt,
+        ticket_row,
+    )
+
+    # All parts run on one event loop and share its client's pooled connections
+    limit = asyncio.Semaphore(workers)
+
+    async def ticket(node: OrgNode) -> dict:
+        async with limit:
+            return ticket_row(node, await create_ticket_with_prompt(node))
+
+    try:
+        for path, nodes in parts.items():
+            write_parquet(
+                DataFrame(await asyncio.gather(*(ticket(node) for node in nodes))),
+                path,
+            )
+            progress.update(1)
+    finally:
+        await close_client()
+
+
+@app.command()
+def tickets(
+    num_managers: int = typer.Option(..., help="Number of managers"),
+    max_employees: int = typer.Option(..., help="Maximum employees per manager"),
+    seed: int = typer.Option(0, help="Generator seed"),
+    batch_size: int = typer.Option(100, help="Employees per written part"),
+    workers: int = typer.Option(8, help="Concurrent LLM requests"),
+    duckdb: Path = typer.Option(None, help="Also write a `tickets` table here"),
+) -> None:
+    """Generate one ticket per employee of an org for the Ticketing page."""
+    from src.ticketing.ticketing_page import tickets_path
+
+    org = load_org((num_managers, max_employees, seed))
+    output = tickets_path(org.fingerprint)
+    if not output.exists():
+        employees = [
+            OrgNode(org, index)
+            for index in range(len(org))
+            if org.designations[org.designation[index]] != "CEO"
+        ]
+        # Parts are only reused by runs that split the employees the same way
+        parts_dir = output.parent / f"parts_batch{batch_size}"
+        parts = {
+            parts_dir / f"part-{start // batch_size:05d}.parquet": (
+                employees[start : start + batch_size]
+            )
+            for start in range(0, len(employees), batch_size)
+        }
+        pending = {path: nodes for path, nodes in parts.items() if not path.exists()}
+        typer.echo(f"{len(parts) - len(pending)} of {len(parts)} parts already done")
+
+        with typer.progressbar(length=len(pending), label="Generating tickets") as bar:
+            asyncio.run(_ticket_parts(pending, workers, bar))
+        generated = concat([read_parquet(path) for path in parts])
+        if len(generated) != len(employees):
+            raise typer.BadParameter(
+                f"Parts in {parts_dir} hold {len(generated)} tickets for "
+                f"{len(employees)} employees; delete them to regenerate"
+            )
+        write_parquet(generated, output)
+
+    typer.echo(f"Tickets saved to {output}")
+    if duckdb is not None:
+        write_duckdb(read_parquet(output), duckdb, "tickets")
+
+
+@app.command()
+def optimize(
+    num_managers: int = typer.Option(..., help="Number of managers"),
+    max_employees: int = typer.Option(..., help="Maximum employees per manager"),
+    seed: int = typer.Option(0, help="Generator seed"),
+    max_tickets_per_employee: int = typer.Option(5, help="Tickets per employee"),
+    min_department_tickets: int = typer.Option(0, help="Tickets per department"),
+    workers: int = typer.Option(1, help="Solver threads"),
+    force: bool = typer.Option(False, help="Re-solve even if already solved"),
+    duckdb: Path = typer.Option(None, help="Also write an `optimized_tickets` table"),
+) -> None:
+    """Solve the team composition problem for an org's precomputed tickets."""
+    from src.optimization.optimization_page import (
+        optimize_team_composition,
+        optimized_path,
+    )
+    from src.ticketing.ticketing_page import tickets_path
+
+    org = load_org((num_managers, max_employees, seed))
+    source = tickets_path(org.fingerprint)
+    if not source.exists():
+        raise typer.BadParameter(f"No tickets at {source}, run `tickets` first")
+    output = optimized_path(source, max_tickets_per_employee, min_department_tickets)
+
+    if force or not output.exists():
+        tickets = read_parquet(source).with_columns(arange(0, count()).alias("index"))
+        constraints = {"max_tickets_per_employee": max_tickets_per_employee} | {
+            f"min_{department}_tickets": min_department_tickets
+            for department in tickets.get_column("department").unique()
+        }
+        typer.echo(f"Solving for {len(tickets)} tickets...")
+        write_parquet(
+            optimize_team_composition(tickets, constraints, threads=workers), output
+        )
+
+    typer.echo(f"Optimized tickets saved to {output}")
+    if duckdb is not None:
+        write_duckdb(read_parquet(output), duckdb, "optimized_tickets")
+
+
+if __name__ == "__main__":
+    app()
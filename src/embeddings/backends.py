@@ -0,0 +1,232 @@
+"""Optimized CPU inference backends for the sentence-transformers models.
+
+`torch` runs the model as published in fp32. `int8` applies dynamic int8
+quantization to its linear layers. `onnx` exports the transformer to ONNX and
+runs it in an onnxruntime session, pooling the token embeddings in numpy.
+Converted models are cached under `MODEL_CACHE_DIR`, so the conversion only
+happens on the first load. torch, sentence-transformers and onnxruntime are
+imported when a backend is loaded.
+
+Converted models drift slightly from fp32, so check them with
+`similarity_agreement` before serving them against embeddings built in fp32.
+"""
+
+import json
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+BACKENDS = ("torch", "int8", "onnx")
+
+ONNX_INPUTS = ("input_ids", "attention_mask", "token_type_ids")
+
+
+def artifact_dir(cache_dir: Path, model_version: str, backend: str) -> Path:
+    """Directory caching a model version converted for a backend."""
+    return cache_dir / re.sub(r"\W", "_", model_version) / backend
+
+
+def _write_atomically(directory: Path, write: Any) -> None:
+    # Convert into a staging directory so `directory` only ever holds a
+    # complete artifact, even if the conversion is interrupted
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(dir=directory.parent, prefix=".staging-"))
+    try:
+        write(staging)
+        try:
+            staging.rename(directory)
+        except OSError:
+            # Another process or thread converted the same model first
+            if not directory.exists():
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def load_int8(model_version: str, directory: Path) -> Any:
+    """Load a model with int8 dynamically quantized linear layers.
+
+    Args:
+        model_version (str): Name of the pre-trained model
+        directory (Path): Where the quantized model is cached
+
+    Returns:
+        SentenceTransformer: The quantized model.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer  # type: ignore
+
+    path = directory / "model.pt"
+    if not path.exists():
+
+        def write(staging: Path) -> None:
+            model = torch.quantization.quantize_dynamic(
+                SentenceTransformer(model_version, device="cpu"),
+                {torch.nn.Linear},
+                dtype=torch.qint8,
+            )
+            torch.save(model, staging / path.name)
+
+        _write_atomically(directory, write)
+    return torch.load(path, map_location="cpu")
+
+
+def _export_onnx(model_version: str, staging: Path) -> None:
+    import torch
+    from sentence_transformers import SentenceTransformer, models  # type: ignore
+
+    model = SentenceTransformer(model_version, device="cpu")
+    transformer, pooling, *rest = model
+    if not isinstance(pooling, models.Pooling) or any(
+        not isinstance(module, models.Normalize) for module in rest
+    ):
+        raise ValueError(
+            f"Model '{model_version}' has modules the onnx backend cannot run"
+        )
+    pooling_mode = pooling.get_pooling_mode_str()
+    if pooling_mode not in ("mean", "cls", "max"):
+        raise ValueError(f"Pooling '{pooling_mode}' is not supported by onnx")
+
+    tokenizer = transformer.tokenizer
+    sample = tokenizer(["export"], return_tensors="pt")
+    names = [name for name in ONNX_INPUTS if name in sample]
+
+    class TokenEmbeddings(torch.nn.Module):
+        def __init__(self) -> None:
+            super().__init__()
+            self.auto_model = transformer.auto_model
+
+        def forward(self, *inputs: torch.Tensor) -> torch.Tensor:
+            return self.auto_model(**dict(zip(names, inputs)))[0]
+
+    axes = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            TokenEmbeddings().eval(),
+            tuple(sample[name] for name in names),
+            str(staging / "model.onnx"),
+            input_names=names,
+            output_names=["token_embeddings"],
+            dynamic_axes={name: axes for name in [*names, "token_embeddings"]},
+            opset_version=14,
+        )
+    tokenizer.save_pretrained(str(staging))
+    (staging / "pooling.json").write_text(
+        json.dumps(
+            {
+                "pooling_mode": pooling_mode,
+                "normalize": bool(rest),
+                "max_seq_length": transformer.max_seq_length,
+            }
+        )
+    )
+
+
+class OnnxEncoder:
+    """`SentenceTransformer.encode` over an ONNX export of the model."""
+
+    def __init__(self, model_version: str, directory: Path) -> None:
+        """Load the ONNX export of a model, exporting it first if not cached.
+
+        Args:
+            model_version (str): Name of the pre-trained model
+            directory (Path): Where the ONNX export is cached
+        """
+        import onnxruntime  # type: ignore
+        from transformers import AutoTokenizer  # type: ignore
+
+        if not (directory / "model.onnx").exists():
+            _write_atomically(
+                directory, lambda staging: _export_onnx(model_version, staging)
+            )
+        self.tokenizer = AutoTokenizer.from_pretrained(str(directory))
+        self.session = onnxruntime.InferenceSession(
+            str(directory / "model.onnx"), providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [node.name for node in self.session.get_inputs()]
+        config = json.loads((directory / "pooling.json").read_text())
+        self.pooling_mode: str = config["pooling_mode"]
+        self.normalize: bool = config["normalize"]
+        self.max_seq_length: int = config["max_seq_length"]
+
+    def _pool(self, tokens: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        if self.pooling_mode == "cls":
+            return tokens[:, 0]
+        mask = mask[..., None].astype(tokens.dtype)
+        if self.pooling_mode == "max":
+            return np.where(mask > 0, tokens, -1e9).max(axis=1)
+        return (tokens * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+
+    def encode(
+        self, sentences: list[str], batch_size: int = 32, **kwargs: Any
+    ) -> np.ndarray:
+        """Embed sentences like `SentenceTransformer.encode` with numpy output.
+
+        Args:
+            sentences (list[str]): Texts to embed
+            batch_size (int): Texts per onnxruntime call
+            **kwargs (Any): Other `SentenceTransformer.encode` options, ignored
+
+        Returns:
+            np.ndarray: One embedding per sentence
+        """
+        batches = []
+        for start in range(0, len(sentences), batch_size):
+            inputs = self.tokenizer(
+                sentences[start : start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            (tokens,) = self.session.run(
+                None, {name: inputs[name] for name in self.input_names}
+            )
+            embeddings = self._pool(tokens, inputs["attention_mask"])
+            if self.normalize:
+                norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+                embeddings = embeddings / np.maximum(norms, 1e-12)
+            batches.append(embeddings.astype(np.float32))
+        return np.concatenate(batches) if batches else np.empty((0, 0), np.float32)
+
+
+def similarity_agreement(
+    reference: np.ndarray, candidate: np.ndarray, k: int = 10
+) -> dict[str, float]:
+    """Compare a backend's embeddings of some texts to the fp32 embeddings.
+
+    Args:
+        reference (np.ndarray): fp32 embeddings, one row per text
+        candidate (np.ndarray): Embeddings of the same texts by another backend
+        k (int): Neighbours compared per text
+
+    Returns:
+        dict[str, float]: Mean and minimum cosine similarity between each
+            text's two embeddings, largest change of a text-to-text cosine
+            similarity, and share of each text's top `k` neighbours kept
+    """
+
+    def normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float64)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    reference, candidate = normalize(reference), normalize(candidate)
+    row_cosine = (reference * candidate).sum(axis=1)
+    reference_sims, candidate_sims = reference @ reference.T, candidate @ candidate.T
+    k = min(k, len(reference) - 1)
+    neighbours = [
+        np.argsort(-sims, axis=1)[:, 1 : k + 1]
+        for sims in (reference_sims, candidate_sims)
+    ]
+    overlap = [len(set(a) & set(b)) / k for a, b in zip(*neighbours)] if k else [1.0]
+    return {
+        "mean_cosine": float(row_cosine.mean()),
+        "min_cosine": float(row_cosine.min()),
+        "max_similarity_error": float(np.abs(reference_sims - candidate_sims).max()),
+        "topk_overlap": float(np.mean(overlap)),
+    }
@@ -1,20 +1,79 @@
 """Script to embed provided text data into a vector space using pre-trained word embeddings."""
 
+from functools import lru_cache
 from pprint import pprint
+from typing import Any
 
+import numpy as np
 from polars import DataFrame, concat
-from sentence_transformers import SentenceTransformer  # type: ignore
 from tqdm import tqdm  # type: ignore
 
-from src.logger import setup_logging
+from src.embeddings.backends import BACKENDS, OnnxEncoder, artifact_dir, load_int8
+from src.embeddings.versions import create_version_query, version_table
+from src.logger import increment, setup_logging, span
 from src.query_db import execute_query
-from src.schemas.db_settings import DBSettings
-from src.schemas.model import ModelSettings
-from src.schemas.sql import SQLModel
+from src.schemas.settings import settings
 
-model_settings = ModelSettings()  # type: ignore
-db_settings = DBSettings()  # type: ignore
-sql_model = SQLModel()  # type: ignore
+
+@lru_cache(maxsize=4)
+def load_model(model_version: str, backend: str = "torch") -> Any:
+    """Load a sentence-transformers model once per model version and backend.
+
+    torch, sentence-transformers and onnxruntime are imported here rather than
+    at module load so that importing the pipeline stays cheap.
+
+    Args:
+        model_version (str): Name of the pre-trained model
+        backend (str): `torch` for fp32, `int8` for a dynamically quantized
+            model or `onnx` for an onnxruntime session, see `backends`
+
+    Returns:
+        SentenceTransformer | OnnxEncoder: The loaded model.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    directory = artifact_dir(settings.model.MODEL_CACHE_DIR, model_version, backend)
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer  # type: ignore
+
+        return SentenceTransformer(model_version)
+    if backend == "int8":
+        return load_int8(model_version, directory)
+    if backend == "onnx":
+        return OnnxEncoder(model_version, directory)
+    raise ValueError(f"Unknown inference backend '{backend}', expected {BACKENDS}")
+
+
+def fuse_embeddings(
+    titles: list[list[float]],
+    descriptions: list[list[float]],
+    title_weight: float,
+    description_weight: float,
+) -> np.ndarray:
+    """Fuse title and description embeddings into one unit vector per row.
+
+    Both embeddings are normalized before weighting, so the cosine similarity
+    of a query to the fused vector is proportional to the weighted sum of its
+    title and description similarities, and hybrid search scans one vector.
+
+    Args:
+        titles (list[list[float]]): Title embeddings
+        descriptions (list[list[float]]): Description embeddings
+        title_weight (float): Weight of the title embedding
+        description_weight (float): Weight of the description embedding
+
+    Returns:
+        np.ndarray: Fused unit vectors, one row per occupation
+    """
+
+    def normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    fused = title_weight * normalize(np.asarray(titles, dtype=np.float64))
+    fused += description_weight * normalize(np.asarray(descriptions, dtype=np.float64))
+    return normalize(fused)
 
 
 class EmbedsPipeline:
@@ -24,11 +83,38 @@ class EmbedsPipeline:
         logger_name="my_logger",
     )
 
-    def __init__(self, model_version: str) -> None:
-        """Initialize the embeddings pipeline."""
+    def __init__(
+        self,
+        model_version: str,
+        title_weight: float | None = None,
+        description_weight: float | None = None,
+        backend: str | None = None,
+    ) -> None:
+        """Initialize the embeddings pipeline.
+
+        Args:
+            model_version (str): Embeddings model
+            title_weight (float | None): Title weight of the fused hybrid
+                vector, TITLE_WEIGHT from the model settings if None
+            description_weight (float | None): Description weight of the fused
+                hybrid vector, DESCRIPTION_WEIGHT from the model settings if None
+            backend (str | None): Inference backend, INFERENCE_BACKEND from
+                the model settings if None
+        """
 
         self.logger.info("Initializing embeddings pipeline.")
         self.model_version: str = model_version
+        self.title_weight: float = (
+            settings.model.TITLE_WEIGHT if title_weight is None else title_weight
+        )
+        self.description_weight: float = (
+            settings.model.DESCRIPTION_WEIGHT
+            if description_weight is None
+            else description_weight
+        )
+        self.backend: str = (
+            settings.model.INFERENCE_BACKEND if backend is None else backend
+        )
 
     @log_time_date
     def embed_data(
@@ -42,7 +128,8 @@ class EmbedsPipeline:
         Returns:
             DataFrame: DataFrame with a single column containing arrays of floats
         """
-        model = SentenceTransformer(self.model_version)
+        with span("load_model"):
+            model = load_model(self.model_version, self.backend)
         embeds: list[list[float]] = []
 
         column_data: list[float] = data.get_column(column).to_list()
@@ -58,28 +145,36 @@ class EmbedsPipeline:
                 show_progress_bar=True,
             )
             embeds.extend(batch_embeds.tolist())
+            increment("rows_embedded", len(batch_embeds))
 
         return DataFrame({f"{column}_embeddings": embeds})
 
-    @log_time_date
-    def run(self, sample_data: bool) -> None:
-        """Run the embeddings pipeline to embed the ONET data into a vector space.
-        First, the ONET data is queried from the database.
-        Then, the title and description columns are embedded into a vector space using pre-trained word embeddings.
-        Finally, the embedded data is written as a table in the database.
+    def load_onet_data(self, sample_data: bool) -> DataFrame:
+        """Query the ONET occupations to embed.
 
         Args:
-            sample (bool): Whether to sample the data before embedding
+            sample_data (bool): Whether to only load a 100 row sample
 
         Returns:
-            None
+            DataFrame: ONET occupations with titles and descriptions
         """
-
-        onet_data: DataFrame = execute_query(
-            sql_model.ONET_QUERY, data=None, params={"lmt": 100 if sample_data else 0}
+        # LIMIT NULL reads every row; LIMIT 0 would read none
+        return execute_query(
+            settings.sql.ONET_QUERY,
+            data=None,
+            params={"lmt": 100 if sample_data else None},  # type: ignore
         )
 
-        self.logger.info("Beginning embeddings pipeline...")
+    def embed_onet_data(self, onet_data: DataFrame) -> DataFrame:
+        """Add title, description and fused hybrid embeddings to ONET occupations.
+
+        Args:
+            onet_data (DataFrame): ONET occupations
+
+        Returns:
+            DataFrame: The occupations with `titles_embeddings`,
+                `descriptions_embeddings` and `fused_embeddings` columns
+        """
         embeddings: dict[str, DataFrame] = {}
         for embeds_column in ["titles", "descriptions"]:
             self.logger.info(f"Embedding {embeds_column} data...")
@@ -88,24 +183,65 @@ class EmbedsPipeline:
             )
             embeddings[embeds_column] = embeds_data
 
-        # Concatenate the title and description embeddings DataFrames
-        embeddings_data = concat(
+        fused = fuse_embeddings(
+            embeddings["titles"].get_column("titles_embeddings").to_list(),
+            embeddings["descriptions"].get_column("descriptions_embeddings").to_list(),
+            self.title_weight,
+            self.description_weight,
+        )
+
+        # Concatenate the title, description and fused embeddings DataFrames
+        return concat(
             [
                 onet_data,
                 embeddings["titles"],
                 embeddings["descriptions"],
+                DataFrame({"fused_embeddings": fused.tolist()}),
             ],
             how="horizontal",
         )
 
+    def save_embeddings(self, embeddings_data: DataFrame) -> None:
+        """Write embedded occupations to the table of this model version.
+
+        Other model versions' tables are left untouched.
+
+        Args:
+            embeddings_data (DataFrame): Output of `embed_onet_data`
+        """
         execute_query(
-            sql_model.EMBEDS_QUERY,
+            create_version_query(
+                self.model_version, settings.sql.EMBEDS_QUERY.read_text()
+            ),
             data=embeddings_data,
-            params={"model_version": self.model_version},
+            params={
+                "model_version": self.model_version,
+                "title_weight": self.title_weight,
+                "description_weight": self.description_weight,
+                "inference_backend": self.backend,
+            },
         )
-
         self.logger.info("Embeddings saved!")
 
+    @log_time_date
+    def run(self, sample_data: bool) -> None:
+        """Run the embeddings pipeline to embed the ONET data into a vector space.
+        First, the ONET data is queried from the database.
+        Then, the title and description columns are embedded into a vector space using pre-trained word embeddings.
+        Finally, the embedded data is written to the model version's table, `onet_embeddings__<model>`.
+
+        Args:
+            sample (bool): Whether to sample the data before embedding
+
+        Returns:
+            None
+        """
+
+        onet_data: DataFrame = self.load_onet_data(sample_data)
+
+        self.logger.info("Beginning embeddings pipeline...")
+        self.save_embeddings(self.embed_onet_data(onet_data))
+
         # Show the new table with embeddings
-        query = """SELECT * FROM onet_with_embeddings LIMIT 5;"""
+        query = f"""SELECT * FROM "{version_table(self.model_version)}" LIMIT 5;"""
         pprint(execute_query(query))
@@ -1,28 +1,47 @@
 """This module contains the Streamlit page for the embeddings pipeline."""
 
 from pathlib import Path
+from threading import Event
 
 import streamlit as st
 from polars import DataFrame, concat
 
 from src.duck import DBDuck
 from src.embeddings.embed_data import EmbedsPipeline
+from src.embeddings.versions import is_built, use_version, version_backend
+from src.jobs import check_cancelled, get_queue, show_job
+from src.logger import span
 from src.query_db import execute_query
-from src.schemas.db_settings import DBSettings
-from src.schemas.model import ModelSettings
-from src.schemas.sql import SQLModel
-
-model_settings = ModelSettings()  # type: ignore
-db_settings = DBSettings()  # type: ignore
-sql_model = SQLModel()  # type: ignore
+from src.schemas.settings import settings
+
+
+def run_pipeline_job(
+    cancelled: Event, model_version: str, sample_data: bool
+) -> DataFrame:
+    """Run the embeddings pipeline as a job, stopping between stages if cancelled.
+
+    Args:
+        cancelled (Event): Set when the job is cancelled
+        model_version (str): Embeddings model
+        sample_data (bool): Whether to only embed a sample
+
+    Returns:
+        DataFrame: The model version and the number of rows embedded
+    """
+    pipeline = EmbedsPipeline(model_version)
+    onet_data = pipeline.load_onet_data(sample_data)
+    check_cancelled(cancelled)
+    embeddings_data = pipeline.embed_onet_data(onet_data)
+    check_cancelled(cancelled)
+    pipeline.save_embeddings(embeddings_data)
+    return DataFrame(
+        {"model_version": [model_version], "rows_embedded": [len(onet_data)]}
+    )
 
 
 def embeddings_page() -> None:
     st.title("Embeddings Pipeline")
 
-    if "pipeline_run" not in st.session_state:
-        st.session_state.pipeline_run = False
-
     if "job_embeds" not in st.session_state:
         st.session_state.job_embeds = None
 
@@ -45,15 +64,63 @@ def embeddings_page() -> None:
 
     is_sample = st.sidebar.radio("Sample the data?", options=["Yes", "No"], index=0)
 
+    # Hybrid search scans the fused title + description vectors built at ingestion
+    search_mode = st.sidebar.radio(
+        "Match jobs on:", options=["Title", "Title + Description"], index=0
+    )
+    hybrid = search_mode == "Title + Description"
+    rerank = hybrid and st.sidebar.checkbox(
+        "Re-rank candidates with custom weights", value=False
+    )
+    if rerank:
+        default_weight = settings.model.TITLE_WEIGHT / (
+            settings.model.TITLE_WEIGHT + settings.model.DESCRIPTION_WEIGHT
+        )
+        candidates = st.sidebar.slider(
+            "Candidates to re-rank", min_value=5, max_value=200, value=50
+        )
+        title_weight = st.sidebar.slider(
+            "Title weight", min_value=0.0, max_value=1.0, value=default_weight
+        )
+
     if st.sidebar.button("Run Pipeline"):
-        with st.spinner("Running embeddings pipeline..."):
-            pipeline = EmbedsPipeline(model_version)
-            pipeline.run(is_sample == "Yes")
+        # The pipeline runs on the shared job queue; identical runs in progress
+        # share one job, and a finished one is rebuilt since Run was asked for
+        sample_data = is_sample == "Yes"
+        st.session_state.pipeline_job = get_queue().submit(
+            "embeddings",
+            {
+                "model_version": model_version,
+                "sample_data": sample_data,
+                "title_weight": settings.model.TITLE_WEIGHT,
+                "description_weight": settings.model.DESCRIPTION_WEIGHT,
+                "backend": settings.model.INFERENCE_BACKEND,
+            },
+            run_pipeline_job,
+            model_version,
+            sample_data,
+            rerun=True,
+        )
+
+    if st.session_state.get("pipeline_job"):
+        record = show_job(st.session_state.pipeline_job)
+        if record is not None and record.status == "done":
             st.success("Embeddings pipeline completed successfully!")
-            st.session_state.pipeline = pipeline
-            st.session_state.pipeline_run = True
+            st.session_state.pipeline_job = None
+
+    # Each model's embeddings are kept in their own table, so switching to a
+    # model that was already built needs no re-embedding
+    if (
+        getattr(st.session_state.get("pipeline"), "model_version", None)
+        != model_version
+    ):
+        st.session_state.pipeline = EmbedsPipeline(model_version)
+        st.session_state.job_embeds = None
+        st.session_state.skills = None
 
-    if st.session_state.pipeline_run:
+    if not is_built(model_version):
+        st.info(f"No embeddings built for {model_version} yet, run the pipeline.")
+    else:
         jobtitle: str = st.text_input("Enter the name of a job")
 
         if st.button("Find Similar Jobs"):
@@ -66,26 +133,31 @@ def embeddings_page() -> None:
                 st.success("Similar jobs found!")
 
             if st.session_state.job_embeds is not None:
-                with DBDuck() as quack:
+                with DBDuck() as quack, span("similarity_search"):
                     quack.register("j_embeds", st.session_state.job_embeds)
-                    query_result = DataFrame(
-                        quack.execute("""
-                        WITH job_embeds_cte AS (
-                            SELECT jobtitle, jobtitle_embeddings
-                            FROM j_embeds
+                    use_version(quack, model_version)
+                    built_with = version_backend(quack, model_version)
+                    if built_with not in (None, st.session_state.pipeline.backend):
+                        st.warning(
+                            f"Embeddings for {model_version} were built with the "
+                            f"{built_with} backend but the query is embedded with "
+                            f"{st.session_state.pipeline.backend}; rebuild them to "
+                            "compare like with like."
                         )
-                        SELECT
-                            job_embeds_cte.jobtitle AS entered_job,
-                            onet.ONET_ONETSOC_CODE,
-                            onet.ONET_TITLES AS similar_job,
-                            list_cosine_similarity(job_embeds_cte.jobtitle_embeddings, onet.TITLE_EMBEDDINGS) AS similarity,
-                            onet.MEDIAN_SALARY AS median_salary
-                        FROM
-                            job_embeds_cte
-                            CROSS JOIN onet_with_embeddings AS onet
-                        ORDER BY similarity DESC
-                        LIMIT 5
-                    """).fetch_arrow_table()
+                    params = None
+                    if rerank:
+                        query = Path("src/sql/similar_jobs_rerank.sql").read_text()
+                        params = {
+                            "candidates": candidates,
+                            "title_weight": title_weight,
+                            "description_weight": 1 - title_weight,
+                        }
+                    elif hybrid:
+                        query = Path("src/sql/similar_jobs_fused.sql").read_text()
+                    else:
+                        query = Path("src/sql/similar_jobs.sql").read_text()
+                    query_result = DataFrame(
+                        quack.execute(query, params).fetch_arrow_table()
                     )
                     st.write("Top 5 Similar Job Titles:")
                     st.table(query_result)
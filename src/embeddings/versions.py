@@ -0,0 +1,81 @@
+"""Versioned storage of ONET embeddings, one table per embeddings model.
+
+Each model's embeddings live in their own `onet_embeddings__<model>` table, so
+building one model never overwrites another. Lookups go through the
+`onet_with_embeddings` name, which `use_version` points at the selected
+model's table for the connection, so the similarity queries always compare
+against vectors from the model that embedded the query.
+"""
+
+import re
+
+from duckdb import DuckDBPyConnection
+
+from src.duck import DBDuck
+
+TABLE_PREFIX = "onet_embeddings__"
+
+
+def version_table(model_version: str) -> str:
+    """Name of the table holding the embeddings of a model version."""
+    return TABLE_PREFIX + re.sub(r"\W", "_", model_version).lower()
+
+
+def create_version_query(model_version: str, select_query: str) -> str:
+    """Statement (re)building a model version's table from a SELECT query."""
+    return (
+        f'CREATE OR REPLACE TABLE "{version_table(model_version)}" AS\n{select_query}'
+    )
+
+
+def built_tables(quack: DuckDBPyConnection) -> set[str]:
+    """Tables of every model version built so far."""
+    rows = quack.execute(
+        "SELECT table_name FROM duckdb_tables() WHERE starts_with(table_name, ?)",
+        [TABLE_PREFIX],
+    ).fetchall()
+    return {table for (table,) in rows}
+
+
+def is_built(model_version: str) -> bool:
+    """Whether embeddings have been built for a model version."""
+    with DBDuck() as quack:
+        return version_table(model_version) in built_tables(quack)
+
+
+def version_backend(quack: DuckDBPyConnection, model_version: str) -> str | None:
+    """Inference backend a model version's table was built with.
+
+    Tables built before the backend was recorded hold fp32 `torch` embeddings.
+    """
+    table = version_table(model_version)
+    if table not in built_tables(quack):
+        return None
+    columns = {
+        column
+        for (column,) in quack.execute(
+            "SELECT column_name FROM duckdb_columns() WHERE table_name = ?", [table]
+        ).fetchall()
+    }
+    if "INFERENCE_BACKEND" not in columns:
+        return "torch"
+    row = quack.execute(f'SELECT INFERENCE_BACKEND FROM "{table}" LIMIT 1').fetchone()
+    return None if row is None else row[0]
+
+
+def use_version(quack: DuckDBPyConnection, model_version: str) -> None:
+    """Route `onet_with_embeddings` to a model version's table on this connection.
+
+    Args:
+        quack (DuckDBPyConnection): Connection the similarity query runs on
+        model_version (str): Model that embedded the query
+
+    Raises:
+        ValueError: If no embeddings were built for the model version.
+    """
+    table = version_table(model_version)
+    if table not in built_tables(quack):
+        raise ValueError(f"No embeddings built for model '{model_version}'")
+    quack.execute(
+        f'CREATE OR REPLACE TEMP VIEW onet_with_embeddings AS SELECT * FROM "{table}"'
+    )
@@ -0,0 +1,303 @@
+"""Background job queue for long-running pipelines.
+
+Pages submit work instead of running it in the Streamlit script thread and
+then poll its status. A job's id is derived from its kind and inputs, so
+identical submissions from any session share one job. At most `max_workers`
+jobs run at once per server. Finished results are persisted to DuckDB and
+served from there on later submissions, including after a restart.
+
+Cancellation is cooperative: a queued job is dropped, and a running job is
+stopped at the next point where it checks its `cancelled` event.
+"""
+
+import json
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from hashlib import sha256
+from pathlib import Path
+from threading import Event, RLock
+from typing import Any
+
+import duckdb
+import streamlit as st
+from polars import DataFrame
+from pydantic import BaseModel, Field
+
+from src.logger import collect_spans, setup_logging, span
+
+JOBS_DB = Path(".cache/jobs.duckdb")
+
+ACTIVE = ("queued", "running")
+
+logger, _ = setup_logging(logger_name="jobs")
+
+_shown_jobs: ContextVar[list[str] | None] = ContextVar("shown_jobs", default=None)
+
+
+class JobCancelled(Exception):
+    """Raised by a job function that noticed it was cancelled."""
+
+
+class JobRecord(BaseModel):
+    """Status of one submitted job."""
+
+    id: str = Field(..., description="Hash of the job kind and inputs")
+    kind: str = Field(..., description="What the job runs, e.g. 'embeddings'")
+    params: str = Field(..., description="JSON of the inputs the id is derived from")
+    status: str = Field(
+        "queued", description="queued, running, done, failed or cancelled"
+    )
+    submitted_at: datetime = Field(default_factory=datetime.now)
+    finished_at: datetime | None = None
+    error: str | None = None
+    spans: dict[str, float] = Field(
+        default_factory=dict,
+        description="Seconds per span recorded by the job's own thread, not persisted",
+    )
+
+
+def job_id(kind: str, params: dict) -> str:
+    """Stable id of a job, equal for identical submissions."""
+    payload = json.dumps({"kind": kind, "params": params}, sort_keys=True, default=str)
+    return sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def check_cancelled(cancelled: Event) -> None:
+    """Stop a job function at this point if its job was cancelled."""
+    if cancelled.is_set():
+        raise JobCancelled
+
+
+class JobQueue:
+    """Bounded thread pool of deduplicated jobs with results kept in DuckDB."""
+
+    def __init__(self, database: Path = JOBS_DB, max_workers: int = 2) -> None:
+        """Initialize the queue.
+
+        Args:
+            database (Path): DuckDB file holding job records and results
+            max_workers (int): Most jobs running at the same time
+        """
+        database.parent.mkdir(parents=True, exist_ok=True)
+        self._db = duckdb.connect(str(database))
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id VARCHAR PRIMARY KEY,
+                kind VARCHAR,
+                params VARCHAR,
+                status VARCHAR,
+                submitted_at TIMESTAMP,
+                finished_at TIMESTAMP,
+                error VARCHAR
+            )
+            """
+        )
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="job")
+        self._lock = RLock()
+        self._jobs: dict[str, JobRecord] = {}
+        self._futures: dict[str, Future] = {}
+        self._cancel: dict[str, Event] = {}
+
+    def _persist(self, record: JobRecord, result: DataFrame | None = None) -> None:
+        with self._lock:
+            # A job discarded while finishing must not be written back
+            if self._jobs.get(record.id) is not record:
+                return
+            if result is not None:
+                self._db.register("job_result", result.to_arrow())
+                self._db.execute(
+                    f'CREATE OR REPLACE TABLE "result_{record.id}" AS '
+                    "SELECT * FROM job_result"
+                )
+                self._db.unregister("job_result")
+            self._db.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    record.id,
+                    record.kind,
+                    record.params,
+                    record.status,
+                    record.submitted_at,
+                    record.finished_at,
+                    record.error,
+                ],
+            )
+
+    def _load(self, job_id: str) -> JobRecord | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM jobs WHERE id = ?", [job_id]
+            ).fetchone()
+        if row is None:
+            return None
+        return JobRecord(**dict(zip(JobRecord.model_fields, row)))
+
+    def _finish(self, record: JobRecord, status: str, error: str | None = None) -> None:
+        record.status = status
+        record.error = error
+        record.finished_at = datetime.now()
+
+    def _run(
+        self, record: JobRecord, fn: Callable[..., DataFrame], args: tuple
+    ) -> None:
+        cancelled = self._cancel[record.id]
+        try:
+            check_cancelled(cancelled)
+            record.status = "running"
+            with collect_spans() as spans, span(f"job:{record.kind}"):
+                record.spans = spans
+                result = fn(cancelled, *args)
+            check_cancelled(cancelled)
+            # Store the result before reporting the job done so polls can read it
+            self._persist(record, result)
+            self._finish(record, "done")
+        except JobCancelled:
+            self._finish(record, "cancelled")
+        except Exception as error:
+            logger.exception(f"Job {record.kind} {record.id} failed")
+            self._finish(record, "failed", repr(error))
+        self._persist(record)
+
+    def submit(
+        self,
+        kind: str,
+        params: dict,
+        fn: Callable[..., DataFrame],
+        *args: Any,
+        rerun: bool = False,
+    ) -> str:
+        """Submit a job unless an identical one was already submitted.
+
+        A finished, failed or cancelled job is only run again after it is
+        discarded, or when `rerun` is set.
+
+        Args:
+            kind (str): What the job runs
+            params (dict): JSON-serializable inputs identifying the job
+            fn (Callable[..., DataFrame]): Called as `fn(cancelled, *args)`
+            *args (Any): Extra inputs for `fn` that `params` already identifies,
+                e.g. a frame whose hash is in `params`
+            rerun (bool): Run the job again unless it is queued or running,
+                e.g. when its output may have changed outside the queue
+
+        Returns:
+            str: The job id.
+        """
+        key = job_id(kind, params)
+        with self._lock:
+            if rerun:
+                self.discard(key)
+            if self.get(key) is not None:
+                return key
+
+            record = JobRecord(
+                id=key,
+                kind=kind,
+                params=json.dumps(params, sort_keys=True, default=str),
+            )
+            self._jobs[key] = record
+            self._cancel[key] = Event()
+            self._persist(record)
+            self._futures[key] = self._executor.submit(self._run, record, fn, args)
+        return key
+
+    def get(self, job_id: str) -> JobRecord | None:
+        """Current status of a job, or None if it was never submitted."""
+        with self._lock:
+            record = self._jobs.get(job_id)
+        if record is None:
+            record = self._load(job_id)
+            # Jobs left queued or running by a previous server never finish
+            if record is not None and record.status in ACTIVE:
+                record.status = "cancelled"
+        return record
+
+    def result(self, job_id: str) -> DataFrame | None:
+        """Persisted result of a finished job, or None if it is not done."""
+        record = self.get(job_id)
+        if record is None or record.status != "done":
+            return None
+        with self._lock:
+            return DataFrame(
+                self._db.execute(f'SELECT * FROM "result_{job_id}"').fetch_arrow_table()
+            )
+
+    def cancel(self, job_id: str) -> None:
+        """Cancel a queued or running job."""
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None or record.status not in ACTIVE:
+                return
+            self._cancel[job_id].set()
+            dropped = self._futures[job_id].cancel()
+        if dropped:
+            self._finish(record, "cancelled")
+            self._persist(record)
+
+    def discard(self, job_id: str) -> None:
+        """Forget a finished, failed or cancelled job so it can be submitted again."""
+        with self._lock:
+            record = self.get(job_id)
+            if record is None or record.status in ACTIVE:
+                return
+            self._jobs.pop(job_id, None)
+            self._db.execute("DELETE FROM jobs WHERE id = ?", [job_id])
+            self._db.execute(f'DROP TABLE IF EXISTS "result_{job_id}"')
+
+
+@contextmanager
+def watch_jobs() -> Iterator[list[str]]:
+    """Collect the ids of the jobs `show_job` shows in a block, e.g. a page run."""
+    shown: list[str] = []
+    token = _shown_jobs.set(shown)
+    try:
+        yield shown
+    finally:
+        _shown_jobs.reset(token)
+
+
+@st.cache_resource
+def get_queue() -> JobQueue:
+    """The job queue shared by every session of this server."""
+    return JobQueue()
+
+
+def show_job(job_id: str) -> JobRecord | None:
+    """Show a job's status with buttons to refresh, cancel or retry it.
+
+    Args:
+        job_id (str): Job to show
+
+    Returns:
+        JobRecord | None: The job's status.
+    """
+    record = get_queue().get(job_id)
+    if record is None:
+        return None
+    shown = _shown_jobs.get()
+    if shown is not None:
+        shown.append(job_id)
+
+    if record.status in ACTIVE:
+        st.info(
+            f"Job {record.kind} is {record.status} (submitted {record.submitted_at:%H:%M:%S})"
+        )
+        columns = st.columns(2)
+        if columns[0].button("Refresh status", key=f"job_refresh_{job_id}"):
+            st.rerun()
+        if columns[1].button("Cancel", key=f"job_cancel_{job_id}"):
+            get_queue().cancel(job_id)
+            st.rerun()
+    elif record.status in ("failed", "cancelled"):
+        if record.status == "failed":
+            st.error(f"Job {record.kind} failed: {record.error}")
+        else:
+            st.warning(f"Job {record.kind} was cancelled.")
+        if st.button("Retry", key=f"job_retry_{job_id}"):
+            get_queue().discard(job_id)
+            st.rerun()
+    return record
@@ -0,0 +1,101 @@
+"""Paged JSON inspection of large in-memory payloads.
+
+Instead of handing a whole nested structure to `st.json`, these views serialize
+only what is visible: a summary of the current org node with one page of its
+direct reports, or one page of rows from a frame. Rerun cost therefore depends
+on the page size, not on the size of the org or the number of tickets.
+"""
+
+from math import ceil
+
+import streamlit as st
+from polars import DataFrame
+
+from src.org_structure.org_model import OrgNode
+
+
+def node_summary(node: OrgNode) -> dict:
+    """Shallow JSON summary of one employee, with reports counted but not expanded."""
+    return {
+        "id": node["id"],
+        "designation": node["designation"],
+        "department": node["department"],
+        "manager": node["manager"],
+        "team_members": f"{len(node.org.children(node.index))} direct reports",
+    }
+
+
+def page_selector(n_items: int, page_size: int, key: str) -> slice:
+    """Page picker returning the slice of items to show.
+
+    Args:
+        n_items (int): Total number of items
+        page_size (int): Items per page
+        key (str): Streamlit widget key
+
+    Returns:
+        slice: Positions of the items on the selected page.
+    """
+    n_pages = max(ceil(n_items / page_size), 1)
+    page = st.number_input(
+        f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, key=key
+    )
+    start = (int(page) - 1) * page_size
+    return slice(start, min(start + page_size, n_items))
+
+
+def org_json_view(
+    org_structure: OrgNode, page_size: int = 20, key: str = "org_json"
+) -> None:
+    """Browse an org one node and one page of direct reports at a time.
+
+    Args:
+        org_structure (OrgNode): Root of the org to browse
+        page_size (int): Direct reports shown per page
+        key (str): Prefix for the widget and session state keys
+    """
+    org = org_structure.org
+    state_key = f"{key}_path"
+    state = st.session_state.get(state_key)
+    if state is None or state[0] != org.fingerprint:
+        state = (org.fingerprint, [org_structure.index])
+        st.session_state[state_key] = state
+    path = state[1]
+
+    current = OrgNode(org, path[-1])
+    st.caption(
+        " / ".join(
+            f"{OrgNode(org, index)['designation']} {org.ids[index]}" for index in path
+        )
+    )
+    st.json(node_summary(current))
+
+    children = org.children(current.index)
+    visible = children[page_selector(len(children), page_size, f"{key}_page")]
+    st.json([node_summary(OrgNode(org, child)) for child in visible], expanded=False)
+
+    managers = [str(org.ids[child]) for child in visible if org.child_count[child]]
+    columns = st.columns(2)
+    if len(path) > 1 and columns[0].button("Up", key=f"{key}_up"):
+        path.pop()
+        st.rerun()
+    if managers:
+        selected = columns[1].selectbox("Open team of", managers, key=f"{key}_open")
+        if columns[1].button("Open", key=f"{key}_open_button"):
+            path.append(org.index_of(selected))
+            st.rerun()
+
+
+def paged_rows(frame: DataFrame, page_size: int = 25, key: str = "rows") -> DataFrame:
+    """Pick one page of rows from a frame.
+
+    Args:
+        frame (DataFrame): Rows to page through
+        page_size (int): Rows per page
+        key (str): Streamlit widget key
+
+    Returns:
+        DataFrame: The rows on the selected page.
+    """
+    page = page_selector(len(frame), page_size, key)
+    return frame.slice(page.start, page.stop - page.start)
@@ -1,8 +1,202 @@
-"""Logging module for the project"""
+"""Logging and instrumentation module for the project"""
 
-import datetime
+import atexit
+import json
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
 from logging import INFO, Formatter, Logger, StreamHandler, getLogger
-from typing import Any, Callable, Tuple
+from os import environ
+from pathlib import Path
+from threading import Lock
+from typing import Any, Tuple
+
+import numpy as np
+
+_span_stack: ContextVar[tuple[str, ...]] = ContextVar("span_stack", default=())
+_span_sink: ContextVar[dict[str, float] | None] = ContextVar("span_sink", default=None)
+
+
+class Instrumentation:
+    """In-memory aggregate of timed spans and counters for one process run.
+
+    Span durations are measured with the monotonic high-resolution clock and
+    nested spans are recorded under a `parent/child` path. Every completed span
+    and counter increment can also be appended to a JSON-lines file, enabled
+    without code changes by setting `INSTRUMENTATION_JSONL` to a path, and a
+    Prometheus text snapshot is written on exit to `INSTRUMENTATION_PROMETHEUS`.
+    """
+
+    def __init__(self, jsonl_path: str | None = None, max_samples: int = 10_000):
+        """Initialize an empty aggregate.
+
+        Args:
+            jsonl_path (str | None): File to append one JSON record per event to
+            max_samples (int): Most recent durations kept per span for percentiles
+        """
+        self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+        self.max_samples = max_samples
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all recorded spans and counters."""
+        with self._lock:
+            self.calls: dict[str, int] = defaultdict(int)
+            self.totals: dict[str, float] = defaultdict(float)
+            self.samples: dict[str, deque] = defaultdict(
+                lambda: deque(maxlen=self.max_samples)
+            )
+            self.counters: dict[str, float] = defaultdict(float)
+
+    def _export(self, record: dict) -> None:
+        if self.jsonl_path is None:
+            return
+        record["ts"] = time.time()
+        with self.jsonl_path.open("a") as file:
+            file.write(json.dumps(record) + "\n")
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record one completed span."""
+        with self._lock:
+            self.calls[name] += 1
+            self.totals[name] += seconds
+            self.samples[name].append(seconds)
+            self._export({"type": "span", "name": name, "seconds": seconds})
+        sink = _span_sink.get()
+        if sink is not None:
+            sink[name] = sink.get(name, 0.0) + seconds
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Add `value` to a counter, e.g. rows embedded or tokens sent."""
+        with self._lock:
+            self.counters[name] += value
+            self._export({"type": "counter", "name": name, "value": value})
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[str]:
+        """Time a block of code as a span nested under any enclosing span.
+
+        Args:
+            name (str): Span name
+
+        Yields:
+            str: Full `parent/child` path the span is recorded under.
+        """
+        path = _span_stack.get() + (name,)
+        token = _span_stack.set(path)
+        full_name = "/".join(path)
+        start = time.perf_counter()
+        try:
+            yield full_name
+        finally:
+            self.record(full_name, time.perf_counter() - start)
+            _span_stack.reset(token)
+
+    @contextmanager
+    def collect(self) -> Iterator[dict[str, float]]:
+        """Also total the spans completed by this thread in a block separately.
+
+        Unlike the process-wide aggregate, the yielded totals only hold spans
+        recorded in the current context, e.g. by one job on a worker thread.
+
+        Yields:
+            dict[str, float]: Seconds per span path, filled as spans complete.
+        """
+        spans: dict[str, float] = {}
+        token = _span_sink.set(spans)
+        try:
+            yield spans
+        finally:
+            _span_sink.reset(token)
+
+    def timed(self, name: str | None = None) -> Callable:
+        """Decorator recording every call of a function as a span.
+
+        Args:
+            name (str | None): Span name, the function's qualified name if None
+
+        Returns:
+            Callable: The decorator.
+        """
+
+        def decorator(func: Callable) -> Callable:
+            span_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def summary(self) -> list[dict]:
+        """Latency statistics per span, sorted by total time.
+
+        Returns:
+            list[dict]: One row per span with call count, total, mean, p50, p95
+                and max in seconds.
+        """
+        with self._lock:
+            rows = []
+            for name, samples in self.samples.items():
+                values = np.fromiter(samples, dtype=float)
+                rows.append(
+                    {
+                        "span": name,
+                        "calls": self.calls[name],
+                        "total_s": self.totals[name],
+                        "mean_s": self.totals[name] / self.calls[name],
+                        "p50_s": float(np.percentile(values, 50)),
+                        "p95_s": float(np.percentile(values, 95)),
+                        "max_s": float(values.max()),
+                    }
+                )
+        return sorted(rows, key=lambda row: row["total_s"], reverse=True)
+
+    def prometheus_text(self, prefix: str = "opt_sim") -> str:
+        """Render spans and counters in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Metric name prefix
+
+        Returns:
+            str: Exposition text.
+        """
+        lines = [f"# TYPE {prefix}_span_seconds summary"]
+        for row in self.summary():
+            label = f'span="{row["span"]}"'
+            lines += [
+                f'{prefix}_span_seconds{{{label},quantile="0.5"}} {row["p50_s"]}',
+                f'{prefix}_span_seconds{{{label},quantile="0.95"}} {row["p95_s"]}',
+                f"{prefix}_span_seconds_sum{{{label}}} {row['total_s']}",
+                f"{prefix}_span_seconds_count{{{label}}} {row['calls']}",
+            ]
+        lines.append(f"# TYPE {prefix}_counter_total counter")
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'{prefix}_counter_total{{name="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+instrumentation = Instrumentation(jsonl_path=environ.get("INSTRUMENTATION_JSONL"))
+span = instrumentation.span
+collect_spans = instrumentation.collect
+timed = instrumentation.timed
+increment = instrumentation.increment
+
+# Write a Prometheus text snapshot on exit when INSTRUMENTATION_PROMETHEUS is set
+if environ.get("INSTRUMENTATION_PROMETHEUS"):
+    atexit.register(
+        lambda: Path(environ["INSTRUMENTATION_PROMETHEUS"]).write_text(
+            instrumentation.prometheus_text()
+        )
+    )
 
 
 def setup_logging(
@@ -13,6 +207,9 @@ def setup_logging(
     """
     Set up logging configuration and return a logger object and a decorator for logging function execution time.
 
+    Calling this more than once for the same logger reuses its handler instead of
+    adding another one, so log lines are not duplicated.
+
     Args:
         logger_name (str): The name of the logger (default is None, which uses the root logger).
         log_level (int): The logging level (default is logging.INFO).
@@ -31,17 +228,21 @@ def setup_logging(
 
     logger.setLevel(log_level)
 
-    handler = StreamHandler()
+    handler = next(
+        (h for h in logger.handlers if getattr(h, "_project_handler", False)), None
+    )
+    if handler is None:
+        handler = StreamHandler()
+        handler._project_handler = True  # type: ignore
+        logger.addHandler(handler)
     handler.setLevel(log_level)
 
     formatter = Formatter(log_format, datefmt="%Y-%m-%d %H:%M:%S")
     handler.setFormatter(formatter)
 
-    logger.addHandler(handler)
-
     def log_time_date(func: Callable) -> Callable:
         """
-        Decorator function that logs the start and end times of the decorated function.
+        Decorator function that times the decorated function as an instrumentation span.
 
         Args:
             func (Callable): The function to be decorated.
@@ -50,9 +251,10 @@ def setup_logging(
             Callable: The decorated function.
         """
 
+        @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             """
-            Wrapper function that logs the start and end times of the decorated function.
+            Wrapper function that records the duration of the decorated function.
 
             Args:
                 *args (Any): Positional arguments passed to the decorated function.
@@ -61,12 +263,11 @@ def setup_logging(
             Returns:
                 Any: The result of the decorated function.
             """
+            start = time.perf_counter()
+            with span(func.__qualname__):
+                result = func(*args, **kwargs)
             logger.info(
-                f"Function '{func.__name__}' started at {datetime.datetime.now()}"
-            )
-            result = func(*args, **kwargs)
-            logger.info(
-                f"Function '{func.__name__}' finished at {datetime.datetime.now()}"
+                f"Function '{func.__name__}' finished in {time.perf_counter() - start:.4f}s"
             )
             return result
 
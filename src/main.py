@@ -1,18 +1,47 @@
 """Main entry point for the application."""
 
+from collections.abc import Callable
+from importlib import import_module
+
 import streamlit as st
 
-from src.embeddings.embeds_page import embeddings_page
-from src.optimization.optimization_page import generate_optimization_page
-from src.org_structure.generate_page import generate_structure_page
-from src.schemas.db_settings import DBSettings
-from src.schemas.model import ModelSettings
-from src.schemas.sql import SQLModel
-from src.ticketing.ticketing_page import generate_tickets_page
+from src.org_structure.org_store import active_org
+
+# Page name -> (module, function). Modules are imported when a page is first
+# selected, so torch, instructor, pulp and matplotlib only load for the pages
+# that use them; later reruns reuse the module from `sys.modules`.
+PAGES: dict[str, tuple[str, str]] = {
+    "Embeddings": ("src.embeddings.embeds_page", "embeddings_page"),
+    "Org Structure": ("src.org_structure.generate_page", "generate_structure_page"),
+    "Ticketing": ("src.ticketing.ticketing_page", "generate_tickets_page"),
+    "Optimization": (
+        "src.optimization.optimization_page",
+        "generate_optimization_page",
+    ),
+}
+
+# Pages that run on the org generated on the Org Structure page
+ORG_PAGES: tuple[str, ...] = ("Ticketing", "Optimization")
+
 
-model_settings = ModelSettings()  # type: ignore
-db_settings = DBSettings()  # type: ignore
-sql_model = SQLModel()  # type: ignore
+def load_page(page: str) -> Callable:
+    """Import a page's module and return its entry point."""
+    module, function = PAGES[page]
+    return getattr(import_module(module), function)
+
+
+def run_page(page: str) -> None:
+    """Run the selected page."""
+
+    if page in ORG_PAGES:
+        # Reuse the org generated on the Org Structure page instead of regenerating it
+        org_structure = active_org()
+        if org_structure is None:
+            st.warning("Please generate the org structure first.")
+        else:
+            load_page(page)(org_structure)
+    else:
+        load_page(page)()
 
 
 ### choose which page to run in streamlit
@@ -20,23 +49,16 @@ def main() -> None:
     """Main entry point for the application."""
 
     st.sidebar.title("Navigation")
-    page = st.sidebar.radio(
-        "Go to", ["Embeddings", "Org Structure", "Ticketing", "Optimization"]
-    )
-
-    if page == "Embeddings":
-        embeddings_page()
-    elif page == "Org Structure":
-        generate_structure_page()
-    elif page == "Ticketing":
-        org_structure = generate_structure_page()
-        generate_tickets_page(org_structure)
-    elif page == "Optimization":
-        org_structure = generate_structure_page()
-        if "org_structure" not in locals():
-            st.warning("Please generate the org structure first.")
-        else:
-            generate_optimization_page(org_structure)
+    page = st.sidebar.radio("Go to", list(PAGES))
+    profile = st.sidebar.toggle("Profile this page", value=False)
+
+    if profile:
+        # Imported here so the profiler costs nothing unless it is switched on
+        from src.profiling import profile_run, show_profile
+
+        show_profile(profile_run(lambda: run_page(page)))
+    else:
+        run_page(page)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,277 @@
+"""Chart layer for the optimization page.
+
+Charts are drawn from aggregated polars frames rather than raw tickets, so the
+amount of data rendered does not grow with the number of tickets. Matplotlib
+figures are rendered to PNG bytes, closed immediately and memoized on the
+server keyed by a hash of the data; Altair charts ship only the aggregates to
+the browser as a Vega-Lite spec.
+"""
+
+from contextlib import contextmanager
+from hashlib import sha256
+from io import BytesIO
+from typing import TYPE_CHECKING, Iterator
+
+import altair as alt
+import numpy as np
+import streamlit as st
+from polars import DataFrame, col
+from polars import len as pl_len
+
+from src.optimization.metrics import pivot_scenarios
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+BACKENDS: tuple[str, ...] = ("altair", "matplotlib")
+
+BAR_CHARTS: list[tuple[str, str, str, str]] = [
+    (
+        "per_employee",
+        "assigned_to",
+        "avg_priority",
+        "Average Ticket Priority Per Employee",
+    ),
+    ("per_department", "department", "total_tickets", "Total Tickets Per Department"),
+    (
+        "per_department",
+        "department",
+        "unique_employees",
+        "Unique Employees Per Department",
+    ),
+]
+
+COLORS: list[str] = ["blue", "red", "green", "orange"]
+
+
+def frames_key(*frames: DataFrame) -> str:
+    """Hash the schema and contents of polars frames into a cache key.
+
+    Args:
+        *frames (DataFrame): Frames the chart is drawn from
+
+    Returns:
+        str: Hex digest identifying the data.
+    """
+    digest = sha256()
+    for frame in frames:
+        digest.update(str(frame.schema).encode("utf-8"))
+        digest.update(frame.hash_rows().to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+@contextmanager
+def closing_figure(*args, **kwargs) -> Iterator[tuple["Figure", np.ndarray]]:  # type: ignore
+    """Create a matplotlib figure that is always closed on exit.
+
+    Args:
+        *args: Positional arguments for `plt.subplots`
+        **kwargs: Keyword arguments for `plt.subplots`
+
+    Yields:
+        tuple[Figure, np.ndarray]: The figure and its axes.
+    """
+    # pyplot is imported on first use so the default Altair backend never loads it
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(*args, **kwargs)
+    try:
+        yield fig, axes
+    finally:
+        plt.close(fig)
+
+
+def figure_to_png(fig: "Figure") -> bytes:
+    """Render a figure to PNG bytes.
+
+    Args:
+        fig (Figure): Figure to render
+
+    Returns:
+        bytes: PNG image.
+    """
+    buffer = BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def priority_counts(tickets: DataFrame) -> DataFrame:
+    """Count tickets per (employee, priority) pair for the scatter plot."""
+    return (
+        tickets.group_by(["assigned_to", "ticket_priority_int"])
+        .agg(pl_len().alias("tickets"))
+        .sort(["assigned_to", "ticket_priority_int"])
+    )
+
+
+def priority_quantiles(tickets: DataFrame) -> DataFrame:
+    """Five-number summary of ticket priority per department for the box plot."""
+    priority = col("ticket_priority_int")
+    return (
+        tickets.group_by("department")
+        .agg(
+            [
+                priority.min().alias("min"),
+                priority.quantile(0.25).alias("q1"),
+                priority.median().alias("median"),
+                priority.quantile(0.75).alias("q3"),
+                priority.max().alias("max"),
+            ]
+        )
+        .sort("department")
+    )
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def matplotlib_bar_charts(key: str, _metrics: dict, scenarios: list[str]) -> bytes:
+    """Render the before/after bar charts to PNG, memoized by `key`.
+
+    Args:
+        key (str): Hash of the metrics data, see `frames_key`
+        _metrics (dict): Output of `scenario_metrics`, excluded from hashing
+        scenarios (list[str]): Scenario names in plotting order
+
+    Returns:
+        bytes: PNG image.
+    """
+    bar_width = 0.8 / len(scenarios)
+    with closing_figure(3, 1, figsize=(10, 18)) as (fig, axes):
+        for ax, (table, index, value, title) in zip(axes, BAR_CHARTS):
+            wide = pivot_scenarios(_metrics[table], index, value, scenarios)
+            positions = np.arange(len(wide))
+            for offset, scenario in enumerate(scenarios):
+                ax.bar(
+                    positions + offset * bar_width,
+                    wide.get_column(scenario).to_numpy(),
+                    color=COLORS[offset % len(COLORS)],
+                    width=bar_width,
+                    edgecolor="grey",
+                    label=scenario,
+                )
+            ax.set_title(title)
+            ax.set_xticks(positions + bar_width * (len(scenarios) - 1) / 2)
+            ax.set_xticklabels(wide.get_column(index).to_list())
+            ax.legend()
+        return figure_to_png(fig)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def matplotlib_metrics(key: str, _tickets: DataFrame, title: str) -> list[bytes]:
+    """Render the priority scatter and box plots to PNG, memoized by `key`.
+
+    Args:
+        key (str): Hash of the tickets, see `frames_key`
+        _tickets (DataFrame): Tickets with an `assigned_to` column, excluded from hashing
+        title (str): Scenario name used in the chart titles
+
+    Returns:
+        list[bytes]: PNG images of the scatter and box plots.
+    """
+    images = []
+    counts = priority_counts(_tickets)
+    with closing_figure(figsize=(10, 6)) as (fig, ax):
+        tickets = counts.get_column("tickets").to_numpy()
+        ax.scatter(
+            counts.get_column("assigned_to").to_numpy(),
+            counts.get_column("ticket_priority_int").to_numpy(),
+            s=20 * np.sqrt(tickets),
+            alpha=0.6,
+        )
+        ax.set_title(f"Ticket Priority Distribution by Employee - {title}")
+        ax.set_xlabel("Employee ID")
+        ax.set_ylabel("Ticket Priority")
+        ax.grid(True)
+        images.append(figure_to_png(fig))
+
+    quantiles = priority_quantiles(_tickets)
+    with closing_figure(figsize=(10, 6)) as (fig, ax):
+        ax.bxp(
+            [
+                {
+                    "label": row["department"],
+                    "whislo": row["min"],
+                    "q1": row["q1"],
+                    "med": row["median"],
+                    "q3": row["q3"],
+                    "whishi": row["max"],
+                    "fliers": [],
+                }
+                for row in quantiles.iter_rows(named=True)
+            ],
+            showfliers=False,
+        )
+        ax.set_title(f"Ticket Priority Boxplot per Department - {title}")
+        ax.set_xlabel("Department")
+        ax.set_ylabel("Ticket Priority")
+        ax.tick_params(axis="x", labelrotation=45)
+        ax.grid(True)
+        images.append(figure_to_png(fig))
+    return images
+
+
+def altair_bar_charts(metrics: dict, scenarios: list[str]) -> alt.VConcatChart:
+    """Build the before/after bar charts as grouped Vega-Lite bars.
+
+    Args:
+        metrics (dict): Output of `scenario_metrics`
+        scenarios (list[str]): Scenario names in plotting order
+
+    Returns:
+        alt.VConcatChart: One grouped bar chart per metric.
+    """
+    color = alt.Color(
+        "scenario:N",
+        sort=scenarios,
+        scale=alt.Scale(domain=scenarios, range=COLORS[: len(scenarios)]),
+    )
+    return alt.vconcat(
+        *[
+            alt.Chart(metrics[table].select([index, "scenario", value]), title=title)
+            .mark_bar()
+            .encode(
+                x=alt.X(f"{index}:N", title=None),
+                xOffset=alt.XOffset("scenario:N", sort=scenarios),
+                y=alt.Y(f"{value}:Q"),
+                color=color,
+            )
+            for table, index, value, title in BAR_CHARTS
+        ]
+    )
+
+
+def altair_metrics(tickets: DataFrame, title: str) -> list[alt.Chart | alt.LayerChart]:
+    """Build the priority scatter and box plots from aggregated tickets.
+
+    Args:
+        tickets (DataFrame): Tickets with an `assigned_to` column
+        title (str): Scenario name used in the chart titles
+
+    Returns:
+        list[alt.Chart | alt.LayerChart]: Scatter and box plot charts.
+    """
+    scatter = (
+        alt.Chart(
+            priority_counts(tickets),
+            title=f"Ticket Priority Distribution by Employee - {title}",
+        )
+        .mark_circle(opacity=0.6)
+        .encode(
+            x=alt.X("assigned_to:Q", title="Employee ID"),
+            y=alt.Y("ticket_priority_int:Q", title="Ticket Priority"),
+            size=alt.Size("tickets:Q"),
+            tooltip=["assigned_to", "ticket_priority_int", "tickets"],
+        )
+    )
+
+    quantiles = alt.Chart(
+        priority_quantiles(tickets),
+        title=f"Ticket Priority Boxplot per Department - {title}",
+    ).encode(x=alt.X("department:N", title="Department"))
+    boxplot = (
+        quantiles.mark_rule().encode(
+            y=alt.Y("min:Q", title="Ticket Priority"), y2="max:Q"
+        )
+        + quantiles.mark_bar(size=20).encode(y="q1:Q", y2="q3:Q")
+        + quantiles.mark_tick(color="white", size=20).encode(y="median:Q")
+    )
+    return [scatter, boxplot]
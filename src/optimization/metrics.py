@@ -0,0 +1,127 @@
+"""Single-pass metrics kernel for ticket assignments.
+
+All per-employee and per-department aggregates are derived from one grouped
+scan over a frame that stacks every scenario (e.g. before/after optimization or
+simulated runs) under a key column, so the cost of comparing many scenarios
+stays proportional to a single pass over the tickets.
+"""
+
+from polars import DataFrame, LazyFrame, col, collect_all, concat, lit
+from polars import len as pl_len
+
+
+def stack_scenarios(
+    scenarios: dict[str, DataFrame], key: str = "scenario"
+) -> LazyFrame:
+    """Stack several ticket frames into one lazy frame tagged by scenario.
+
+    Args:
+        scenarios (dict[str, DataFrame]): Tickets per scenario name
+        key (str): Name of the scenario column
+
+    Returns:
+        LazyFrame: Tickets with `key`, `assigned_to`, `department` and `ticket_priority_int`.
+    """
+    return concat(
+        [
+            tickets.lazy().select(
+                [
+                    lit(name).alias(key),
+                    col("assigned_to"),
+                    col("department"),
+                    col("ticket_priority_int"),
+                ]
+            )
+            for name, tickets in scenarios.items()
+        ]
+    )
+
+
+def aggregate_metrics(
+    tickets: LazyFrame, key: str = "scenario"
+) -> dict[str, DataFrame]:
+    """Compute per-employee and per-department metrics for every scenario at once.
+
+    The tickets are grouped a single time by (scenario, department, employee)
+    and that result is collected before both metric tables re-aggregate it, as
+    `collect_all` would otherwise evaluate the shared group-by once per table.
+
+    Args:
+        tickets (LazyFrame): Stacked tickets, see `stack_scenarios`
+        key (str): Name of the scenario column
+
+    Returns:
+        dict[str, DataFrame]: `per_employee` with `avg_priority` and
+            `total_tickets` per (scenario, assigned_to), and `per_department`
+            with `total_tickets` and `unique_employees` per (scenario, department).
+    """
+    groups = tickets.group_by([key, "department", "assigned_to"]).agg(
+        [
+            pl_len().alias("total_tickets"),
+            col("ticket_priority_int").sum().alias("priority_sum"),
+            col("ticket_priority_int").count().alias("priority_count"),
+        ]
+    )
+    groups = groups.collect().lazy()
+
+    per_employee = (
+        groups.group_by([key, "assigned_to"])
+        .agg(
+            [
+                (col("priority_sum").sum() / col("priority_count").sum()).alias(
+                    "avg_priority"
+                ),
+                col("total_tickets").sum(),
+            ]
+        )
+        .sort([key, "assigned_to"])
+    )
+    per_department = (
+        groups.group_by([key, "department"])
+        .agg(
+            [
+                col("total_tickets").sum(),
+                pl_len().alias("unique_employees"),
+            ]
+        )
+        .sort([key, "department"])
+    )
+
+    per_employee_df, per_department_df = collect_all([per_employee, per_department])
+    return {"per_employee": per_employee_df, "per_department": per_department_df}
+
+
+def scenario_metrics(scenarios: dict[str, DataFrame]) -> dict[str, DataFrame]:
+    """Compute the metrics tables for named ticket scenarios.
+
+    Args:
+        scenarios (dict[str, DataFrame]): Tickets per scenario name
+
+    Returns:
+        dict[str, DataFrame]: See `aggregate_metrics`, keyed by a `scenario` column.
+    """
+    return aggregate_metrics(stack_scenarios(scenarios))
+
+
+def pivot_scenarios(
+    table: DataFrame, index: str, value: str, scenarios: list[str]
+) -> DataFrame:
+    """Lay out one metric with a column per scenario, filling gaps with zero.
+
+    Args:
+        table (DataFrame): A `per_employee` or `per_department` metrics table
+        index (str): Row label column, `assigned_to` or `department`
+        value (str): Metric column to spread across scenarios
+        scenarios (list[str]): Scenario names in column order
+
+    Returns:
+        DataFrame: `index` followed by one column per scenario.
+    """
+    wide = table.pivot(values=value, index=index, columns="scenario").sort(index)
+    return wide.select(
+        [col(index)]
+        + [
+            col(name).fill_null(0) if name in wide.columns else lit(0).alias(name)
+            for name in scenarios
+        ]
+    )
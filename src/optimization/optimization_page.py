@@ -1,16 +1,36 @@
-from random import choice
+from pathlib import Path
+from threading import Event
 
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns  # type: ignore
 import streamlit as st
-from polars import DataFrame, arange, col, count
-from pulp import LpMinimize, LpProblem, LpVariable, lpSum  # type: ignore
-
-from src.ticketing.ticketing_page import generate_tickets_page
-
-
-def optimize_team_composition(tickets: DataFrame, constraints: dict) -> DataFrame:
+from polars import DataFrame, Series, arange, col, count, read_parquet
+from pulp import PULP_CBC_CMD, LpMinimize, LpProblem, LpVariable, lpSum  # type: ignore
+
+from src.jobs import check_cancelled, get_queue, show_job
+from src.json_view import paged_rows
+from src.logger import increment, span, timed
+from src.optimization.charts import (
+    BACKENDS,
+    altair_bar_charts,
+    altair_metrics,
+    frames_key,
+    matplotlib_bar_charts,
+    matplotlib_metrics,
+)
+from src.optimization.metrics import scenario_metrics
+from src.optimization.simulation import (
+    POLICIES,
+    draw_assignments,
+    simulate_baselines,
+    summarize_simulation,
+)
+from src.org_structure.org_model import OrgNode
+
+
+@timed()
+def optimize_team_composition(
+    tickets: DataFrame, constraints: dict, threads: int | None = None
+) -> DataFrame:
     tickets = tickets.with_columns(
         col("ticket_priority")
         .map_dict({"low": 1, "medium": 2, "high": 3, None: 1})
@@ -51,10 +71,14 @@ def optimize_team_composition(tickets: DataFrame, constraints: dict) -> DataFram
         )
         prob += (
             lpSum([x[i, j] for i in dept_indices for j in indices])
-            >= constraints[f"min_{dept}_tickets"]
+            >= constraints.get(f"min_{dept}_tickets", 0)
         )
 
-    prob.solve()
+    increment("lp_variables", len(x))
+    increment("lp_constraints", len(prob.constraints))
+    with span("lp_solve"):
+        # Let CBC use several threads for batch runs; the page keeps the default
+        prob.solve(PULP_CBC_CMD(threads=threads) if threads else None)
 
     # Extracting and preparing decision variables
     ticket_index = [i for i in indices for j in indices]
@@ -77,179 +101,95 @@ def optimize_team_composition(tickets: DataFrame, constraints: dict) -> DataFram
     )
 
 
-def generate_fake_data(tickets: DataFrame) -> DataFrame:
-    # Simulate less efficient 'assigned_to' values
-    inefficient_assigned = tickets.with_columns(
-        col("index").apply(lambda _: choice(range(len(tickets)))).alias("assigned_to")
+def optimized_path(
+    tickets_file: Path, max_tickets_per_employee: int, min_department_tickets: int
+) -> Path:
+    """Path of a solve precomputed by the batch CLI next to an org's tickets."""
+    return tickets_file.with_name(
+        f"optimized_max{max_tickets_per_employee}_min{min_department_tickets}.parquet"
     )
-    # Retain ticket_priority_int in the fake data
-    fake_tickets = tickets.join(
-        inefficient_assigned.select(["index", "assigned_to"]), on="index", how="left"
+
+
+def precomputed_solve(
+    org_structure: OrgNode, tickets: DataFrame, constraints: dict
+) -> DataFrame | None:
+    """Solve written by `python -m src.cli optimize` for these tickets, if any.
+
+    The page sets no per-department minimums, so only solves with a zero
+    minimum match its constraints.
+    """
+    from src.ticketing.ticketing_page import tickets_path
+
+    path = optimized_path(
+        tickets_path(org_structure.org.fingerprint),
+        constraints["max_tickets_per_employee"],
+        0,
+    )
+    if not path.exists():
+        return None
+    solved = read_parquet(path)
+    # Tickets generated on the page before the CLI ran differ from the CLI's
+    if not solved.get_column("ticket_id").equals(tickets.get_column("ticket_id")):
+        return None
+    return solved
+
+
+def optimize_job(cancelled: Event, tickets: DataFrame, constraints: dict) -> DataFrame:
+    # CBC cannot be interrupted; the queue drops a cancelled solve once it returns
+    return optimize_team_composition(tickets, constraints)
+
+
+def simulate_job(cancelled: Event, tickets: DataFrame, simulation: dict) -> DataFrame:
+    return simulate_baselines(
+        tickets,
+        n_runs=simulation.get("n_runs", 1000),
+        policy=simulation.get("policy", "uniform"),
+        seed=simulation.get("seed"),
+        before_chunk=lambda: check_cancelled(cancelled),
     )
-    return fake_tickets
-
-
-def calculate_metrics(tickets: DataFrame) -> dict:
-    metrics = {
-        "avg_priority_per_employee": tickets.groupby("assigned_to")
-        .agg([col("ticket_priority_int").mean().alias("avg_priority")])
-        .sort("assigned_to"),
-        "total_tickets_per_department": tickets.groupby("department")
-        .agg([count().alias("total_tickets")])
-        .sort("department"),
-        "employees_per_department": tickets.groupby("department")
-        .agg([col("assigned_to").n_unique().alias("unique_employees")])
-        .sort("department"),
-    }
-    return metrics
-
-
-def plot_bar_charts(metrics_before: dict, metrics_after: dict) -> None:
-    # Convert to pandas for easier plotting
-    df_before = {
-        "avg_priority_per_employee": metrics_before[
-            "avg_priority_per_employee"
-        ].to_pandas(),
-        "total_tickets_per_department": metrics_before[
-            "total_tickets_per_department"
-        ].to_pandas(),
-        "employees_per_department": metrics_before[
-            "employees_per_department"
-        ].to_pandas(),
-    }
-    df_after = {
-        "avg_priority_per_employee": metrics_after[
-            "avg_priority_per_employee"
-        ].to_pandas(),
-        "total_tickets_per_department": metrics_after[
-            "total_tickets_per_department"
-        ].to_pandas(),
-        "employees_per_department": metrics_after[
-            "employees_per_department"
-        ].to_pandas(),
-    }
 
-    fig, axes = plt.subplots(3, 1, figsize=(10, 18))
 
-    # Ensure we account for the maximum number of entries in both before and after datasets
-    max_entries = max(
-        len(df_before["avg_priority_per_employee"]),
-        len(df_after["avg_priority_per_employee"]),
+def generate_fake_data(
+    tickets: DataFrame, policy: str = "uniform", seed: int | None = None
+) -> DataFrame:
+    # Simulate one less efficient 'assigned_to' draw, keeping ticket_priority_int
+    assignments = draw_assignments(
+        tickets, n_runs=1, policy=policy, rng=np.random.default_rng(seed)
     )
-    bar_width = 0.35
-    r1 = np.arange(max_entries)
-    r2 = [x + bar_width for x in r1]
-
-    # Define a helper function to safely get data
-    def safe_get(df, index, column):  # type: ignore
-        try:
-            return df[index][column]
-        except IndexError:
-            return 0  # return 0 if index is out of bounds
-
-    # Plot each metric
-    for ax, metric_key, title in zip(
-        axes,
-        [
-            "avg_priority_per_employee",
-            "total_tickets_per_department",
-            "employees_per_department",
-        ],
-        [
-            "Average Ticket Priority Per Employee",
-            "Total Tickets Per Department",
-            "Unique Employees Per Department",
-        ],
-    ):
-        # Plot before optimization
-        ax.bar(
-            r1,
-            [
-                safe_get(
-                    df_before[metric_key],
-                    i,
-                    "avg_priority"
-                    if "avg_priority" in df_before[metric_key].columns
-                    else "total_tickets"
-                    if "total_tickets" in df_before[metric_key].columns
-                    else "unique_employees",
-                )
-                for i in range(max_entries)
-            ],
-            color="blue",
-            width=bar_width,
-            edgecolor="grey",
-            label="Before Optimization",
-        )
-        # Plot after optimization
-        ax.bar(
-            r2,
-            [
-                safe_get(
-                    df_after[metric_key],
-                    i,
-                    "avg_priority"
-                    if "avg_priority" in df_after[metric_key].columns
-                    else "total_tickets"
-                    if "total_tickets" in df_after[metric_key].columns
-                    else "unique_employees",
-                )
-                for i in range(max_entries)
-            ],
-            color="red",
-            width=bar_width,
-            edgecolor="grey",
-            label="After Optimization",
-        )
-        ax.set_title(title)
-        ax.set_xticks([r + bar_width / 2 for r in r1])
-        ax.set_xticklabels(
-            df_before[metric_key]["department"]
-            if "department" in df_before[metric_key].columns
-            else df_before[metric_key]["assigned_to"]
-        )
-        ax.legend()
+    return tickets.with_columns(Series("assigned_to", assignments[0]))
 
-    st.pyplot(fig)
 
+def plot_bar_charts(metrics: dict, scenarios: list[str], backend: str) -> None:
+    if backend == "altair":
+        st.altair_chart(altair_bar_charts(metrics, scenarios), use_container_width=True)
+    else:
+        key = frames_key(metrics["per_employee"], metrics["per_department"])
+        st.image(matplotlib_bar_charts(key, metrics, scenarios))
 
-def plot_metrics(tickets: DataFrame, title: str) -> None:
-    # Ensure DataFrame conversion for plotting
-    df = tickets.to_pandas()
 
-    # Create a scatter plot of ticket priority by assigned employee
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.scatterplot(
-        data=df,
-        x="assigned_to",
-        y="ticket_priority_int",
-        alpha=0.6,
-        ax=ax,
-    )
-    ax.set_title(f"Ticket Priority Distribution by Employee - {title}")
-    ax.set_xlabel("Employee ID")
-    ax.set_ylabel("Ticket Priority")
-    ax.grid(True)
-    st.pyplot(fig)
-
-    # Create a box plot of tickets per department
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.boxplot(data=df, x="department", y="ticket_priority_int", ax=ax)
-    ax.set_title(f"Ticket Priority Boxplot per Department - {title}")
-    ax.set_xlabel("Department")
-    ax.set_ylabel("Ticket Priority")
-    plt.xticks(rotation=45)
-    ax.grid(True)
-    st.pyplot(fig)
-
-
-def generate_plots(tickets_before: DataFrame, tickets_after: DataFrame) -> None:
-    metrics_before = calculate_metrics(tickets_before)
-    metrics_after = calculate_metrics(tickets_after)
-    plot_bar_charts(metrics_before, metrics_after)
-
-
-def generate_optimization_page(org_structure: dict) -> None:
+def plot_metrics(tickets: DataFrame, title: str, backend: str) -> None:
+    if backend == "altair":
+        for chart in altair_metrics(tickets, title):
+            st.altair_chart(chart, use_container_width=True)
+    else:
+        plotted = tickets.select(["assigned_to", "department", "ticket_priority_int"])
+        for image in matplotlib_metrics(frames_key(plotted), plotted, title):
+            st.image(image)
+
+
+def generate_plots(
+    tickets_before: DataFrame, tickets_after: DataFrame, backend: str = "altair"
+) -> None:
+    scenarios = {
+        "Before Optimization": tickets_before,
+        "After Optimization": tickets_after,
+    }
+    plot_bar_charts(scenario_metrics(scenarios), list(scenarios), backend)
+    for title, tickets in scenarios.items():
+        plot_metrics(tickets, title, backend)
+
+
+def generate_optimization_page(org_structure: OrgNode) -> None:
     st.title("Team Composition Optimization")
 
     if "init" not in st.session_state:
@@ -277,6 +217,18 @@ def generate_optimization_page(org_structure: dict) -> None:
         min_employees = st.slider(
             "Minimum Employees per Department", min_value=1, max_value=5, value=2
         )
+        n_simulations = st.slider(
+            "Number of Baseline Simulations",
+            min_value=100,
+            max_value=10000,
+            value=1000,
+            step=100,
+        )
+        baseline_policy = st.selectbox(
+            "Baseline Assignment Policy", options=list(POLICIES)
+        )
+        seed = st.number_input("Simulation Seed", min_value=0, value=42, step=1)
+        chart_backend = st.selectbox("Chart Backend", options=list(BACKENDS))
 
         # Form submission button
         submitted = st.form_submit_button("Initialize and Optimize")
@@ -288,14 +240,24 @@ def generate_optimization_page(org_structure: dict) -> None:
                 "max_ticket_priority_sum_per_employee": max_priority_sum,
                 "min_employees_per_department": min_employees,
             }
+            st.session_state.simulation = {
+                "n_runs": n_simulations,
+                "policy": baseline_policy,
+                "seed": int(seed),
+            }
+            st.session_state.chart_backend = chart_backend
 
     # If tickets are to be generated
     if st.session_state.init:
-        # Generate tickets
+        # Tickets are generated on the job queue; the page is imported here so
+        # the LLM client stack loads only once tickets are needed
+        from src.ticketing.ticketing_page import generate_tickets_page
+
         st.session_state.tickets = generate_tickets_page(org_structure)
 
         if st.session_state.tickets is None:
-            st.write("No tickets found.")
+            # Still generating; the ticket job's status is shown above
+            return
         else:
             # Display unique departments from tickets
             # departments = st.session_state.tickets["department"].unique()
@@ -315,15 +277,57 @@ def generate_optimization_page(org_structure: dict) -> None:
                 st.session_state.tickets = st.session_state.tickets.sort(
                     "index", descending=False
                 )
-                optimized_tickets = optimize_team_composition(
-                    st.session_state.tickets, st.session_state.constraints
+                # Prefer a solve precomputed by the batch CLI, otherwise solve
+                # on the shared job queue; identical inputs share one job
+                queue = get_queue()
+                optimized_tickets = precomputed_solve(
+                    org_structure,
+                    st.session_state.tickets,
+                    st.session_state.constraints,
                 )
+                if optimized_tickets is None:
+                    job = queue.submit(
+                        "optimize",
+                        {
+                            "tickets": frames_key(st.session_state.tickets),
+                            "constraints": st.session_state.constraints,
+                        },
+                        optimize_job,
+                        st.session_state.tickets,
+                        st.session_state.constraints,
+                    )
+                    show_job(job)
+                    optimized_tickets = queue.result(job)
+                    if optimized_tickets is None:
+                        return
 
                 st.write("Optimal Team Composition:")
-                st.dataframe(optimized_tickets)
-
-                # Generate fake data
-                # fake_tickets = generate_fake_data(optimized_tickets)
-
-                # # Generate plots based on fake and optimized data
-                # generate_plots(fake_tickets, optimized_tickets)
+                st.dataframe(paged_rows(optimized_tickets, key="optimized_page"))
+
+                # Simulate baseline assignments and compare against the optimized plan
+                simulation = st.session_state.get("simulation", {})
+                job = queue.submit(
+                    "simulate",
+                    {"tickets": frames_key(optimized_tickets), **simulation},
+                    simulate_job,
+                    optimized_tickets,
+                    simulation,
+                )
+                show_job(job)
+                baseline = queue.result(job)
+                if baseline is None:
+                    return
+                st.write("Baseline Simulations vs. Optimized Plan:")
+                st.dataframe(summarize_simulation(baseline, optimized_tickets))
+
+                # Generate plots based on one simulated baseline and optimized data
+                fake_tickets = generate_fake_data(
+                    optimized_tickets,
+                    policy=simulation.get("policy", "uniform"),
+                    seed=simulation.get("seed"),
+                )
+                generate_plots(
+                    fake_tickets,
+                    optimized_tickets,
+                    backend=st.session_state.get("chart_backend", "altair"),
+                )
@@ -0,0 +1,275 @@
+"""Monte Carlo simulation of baseline ticket assignments.
+
+Draws many random or policy-based "inefficient" assignments for a set of tickets
+as NumPy arrays in one shot, computes the per-employee and per-department metrics
+for all of them with one grouped aggregation and summarises their distribution
+against the optimized plan.
+"""
+
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+from polars import DataFrame, col, concat
+from polars import len as pl_len
+
+from src.logger import timed
+from src.optimization.metrics import aggregate_metrics
+
+POLICIES: tuple[str, ...] = ("uniform", "round_robin", "department")
+
+RUN_STATISTICS: tuple[str, ...] = (
+    "mean_avg_priority",
+    "max_avg_priority",
+    "employees_used",
+    "max_tickets_per_employee",
+    "min_employees_per_department",
+)
+
+
+def spawn_seeds(seed: int | None, n_streams: int) -> list[np.random.SeedSequence]:
+    """Split a root seed into independent child seed sequences.
+
+    Each child can be shipped to a separate process and turned into its own
+    generator with `np.random.default_rng`, and the streams never overlap.
+
+    Args:
+        seed (int | None): Root seed. None draws fresh entropy from the OS.
+        n_streams (int): Number of independent streams to create.
+
+    Returns:
+        list[np.random.SeedSequence]: One seed sequence per stream.
+    """
+    return np.random.SeedSequence(seed).spawn(n_streams)
+
+
+def draw_assignments(
+    tickets: DataFrame,
+    n_runs: int,
+    policy: str = "uniform",
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """Draw `n_runs` baseline assignments for every ticket at once.
+
+    Employees are identified by their row position in `tickets`, the same
+    convention `optimize_team_composition` uses for `assigned_to`.
+
+    Policies:
+        uniform: every ticket goes to an employee drawn uniformly at random.
+        round_robin: tickets are dealt out in order starting at a random employee.
+        department: every ticket goes to a random employee of its own department.
+
+    Args:
+        tickets (DataFrame): Tickets, one row per employee
+        n_runs (int): Number of simulated assignments to draw
+        policy (str): Baseline policy, one of `POLICIES`
+        rng (np.random.Generator | None): Random generator, a fresh one if None
+
+    Returns:
+        np.ndarray: Integer array of shape (n_runs, n_tickets) with the employee
+            index each ticket is assigned to in each run.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy '{policy}', expected one of {POLICIES}")
+
+    rng = np.random.default_rng() if rng is None else rng
+    n_tickets = len(tickets)
+
+    if policy == "uniform":
+        return rng.integers(0, n_tickets, size=(n_runs, n_tickets))
+
+    if policy == "round_robin":
+        offsets = rng.integers(0, n_tickets, size=(n_runs, 1))
+        return (offsets + np.arange(n_tickets)) % n_tickets
+
+    _, dept_codes = np.unique(
+        tickets.get_column("department").to_numpy(), return_inverse=True
+    )
+    assignments = np.empty((n_runs, n_tickets), dtype=np.int64)
+    for code in np.unique(dept_codes):
+        members = np.flatnonzero(dept_codes == code)
+        picks = rng.integers(0, len(members), size=(n_runs, len(members)))
+        assignments[:, members] = members[picks]
+    return assignments
+
+
+def simulation_metrics(tickets: DataFrame, assignments: np.ndarray) -> dict:
+    """Compute the metrics tables for every simulated run.
+
+    All runs are stacked into one long frame under a `run` key and aggregated
+    with the single-pass kernel in `src.optimization.metrics`.
+
+    Args:
+        tickets (DataFrame): Tickets with `department` and `ticket_priority_int`
+        assignments (np.ndarray): Array of shape (n_runs, n_tickets)
+
+    Returns:
+        dict: `per_employee` and `per_department` tables with a `run` column.
+    """
+    n_runs, n_tickets = assignments.shape
+    runs = DataFrame(
+        {
+            "run": np.repeat(np.arange(n_runs), n_tickets),
+            "assigned_to": assignments.ravel(),
+            "ticket_priority_int": np.tile(
+                tickets.get_column("ticket_priority_int").to_numpy(), n_runs
+            ),
+            "department": np.tile(tickets.get_column("department").to_numpy(), n_runs),
+        }
+    ).lazy()
+    return aggregate_metrics(runs, key="run")
+
+
+def run_statistics(metrics: dict) -> DataFrame:
+    """Reduce per-run metric tables to one row of scalar statistics per run.
+
+    Args:
+        metrics (dict): Output of `simulation_metrics`
+
+    Returns:
+        DataFrame: One row per run with the columns in `RUN_STATISTICS`.
+    """
+    per_employee = (
+        metrics["per_employee"]
+        .group_by("run")
+        .agg(
+            [
+                col("avg_priority").mean().alias("mean_avg_priority"),
+                col("avg_priority").max().alias("max_avg_priority"),
+                pl_len().alias("employees_used"),
+                col("total_tickets").max().alias("max_tickets_per_employee"),
+            ]
+        )
+    )
+    per_department = (
+        metrics["per_department"]
+        .group_by("run")
+        .agg([col("unique_employees").min().alias("min_employees_per_department")])
+    )
+    return per_employee.join(per_department, on="run").sort("run")
+
+
+def _simulate_chunk(
+    departments: np.ndarray,
+    priorities: np.ndarray,
+    n_runs: int,
+    policy: str,
+    seed: np.random.SeedSequence,
+) -> DataFrame:
+    # Workers receive plain arrays: pickling a polars frame from the executor's
+    # feeder thread can deadlock once the polars thread pool is running.
+    tickets = DataFrame({"department": departments, "ticket_priority_int": priorities})
+    rng = np.random.default_rng(seed)
+    assignments = draw_assignments(tickets, n_runs, policy=policy, rng=rng)
+    return run_statistics(simulation_metrics(tickets, assignments))
+
+
+@timed()
+def simulate_baselines(
+    tickets: DataFrame,
+    n_runs: int = 1000,
+    policy: str = "uniform",
+    seed: int | None = None,
+    chunk_size: int = 1000,
+    workers: int = 1,
+    before_chunk: Callable[[], None] | None = None,
+) -> DataFrame:
+    """Simulate `n_runs` baseline assignments and return their run statistics.
+
+    Runs are split into chunks of `chunk_size`, each seeded by its own child of
+    `seed`, so results are reproducible for a given seed and chunk size no
+    matter how many worker processes are used.
+
+    Args:
+        tickets (DataFrame): Tickets with `department` and `ticket_priority_int`
+        n_runs (int): Number of simulated assignments
+        policy (str): Baseline policy, one of `POLICIES`
+        seed (int | None): Root seed for the random streams
+        chunk_size (int): Number of runs simulated together in one array
+        workers (int): Number of processes to spread chunks across
+        before_chunk (Callable[[], None] | None): Called before each chunk is
+            simulated or collected, e.g. to stop a cancelled job by raising
+
+    Returns:
+        DataFrame: One row per run with the columns in `RUN_STATISTICS`.
+    """
+    sizes = [min(chunk_size, n_runs - start) for start in range(0, n_runs, chunk_size)]
+    seeds = spawn_seeds(seed, len(sizes))
+
+    departments = tickets.get_column("department").to_numpy()
+    priorities = tickets.get_column("ticket_priority_int").to_numpy()
+
+    check = before_chunk or (lambda: None)
+    chunks = []
+    if workers > 1 and len(sizes) > 1:
+        # polars is multi-threaded, so forked workers can deadlock; always spawn
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=get_context("spawn")
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _simulate_chunk, departments, priorities, size, policy, chunk_seed
+                )
+                for size, chunk_seed in zip(sizes, seeds)
+            ]
+            try:
+                for future in futures:
+                    check()
+                    chunks.append(future.result())
+            except BaseException:
+                pool.shutdown(cancel_futures=True)
+                raise
+    else:
+        for size, chunk_seed in zip(sizes, seeds):
+            check()
+            chunks.append(
+                _simulate_chunk(departments, priorities, size, policy, chunk_seed)
+            )
+
+    offsets = np.cumsum([0] + sizes[:-1])
+    return concat(
+        [
+            chunk.with_columns(col("run") + int(offset))
+            for chunk, offset in zip(chunks, offsets)
+        ]
+    )
+
+
+def summarize_simulation(
+    baseline: DataFrame, optimized: DataFrame, confidence: float = 0.95
+) -> DataFrame:
+    """Summarise the simulated distribution of each statistic against the optimized plan.
+
+    Args:
+        baseline (DataFrame): Output of `simulate_baselines`
+        optimized (DataFrame): Optimized tickets with an `assigned_to` column
+        confidence (float): Width of the reported percentile interval
+
+    Returns:
+        DataFrame: One row per statistic with the baseline mean, standard
+            deviation, confidence interval, optimized value and the share of
+            baseline runs that are at least as large as the optimized value.
+    """
+    assignments = optimized.get_column("assigned_to").fill_null(-1).to_numpy()
+    optimized_stats = run_statistics(
+        simulation_metrics(optimized, assignments.reshape(1, -1))
+    )
+
+    lower = (1.0 - confidence) / 2.0
+    rows = []
+    for statistic in RUN_STATISTICS:
+        values = baseline.get_column(statistic).cast(float).to_numpy()
+        optimized_value = float(optimized_stats.get_column(statistic)[0])
+        rows.append(
+            {
+                "statistic": statistic,
+                "baseline_mean": float(values.mean()),
+                "baseline_std": float(values.std()),
+                "ci_low": float(np.quantile(values, lower)),
+                "ci_high": float(np.quantile(values, 1.0 - lower)),
+                "optimized": optimized_value,
+                "share_at_least_optimized": float((values >= optimized_value).mean()),
+            }
+        )
+    return DataFrame(rows)
@@ -0,0 +1,113 @@
+"""Level-of-detail org chart rendering.
+
+Only a bounded number of employees is laid out: the tree is expanded breadth
+first from the chosen root until the node budget is spent, and every subtree
+that does not fit is drawn as a single summary node. Rendered SVGs are cached
+by the org fingerprint and view parameters.
+"""
+
+from collections import deque
+
+import numpy as np
+import streamlit as st
+from graphviz import Digraph  # type: ignore
+
+from src.org_structure.org_model import OrgModel
+
+
+def subtree_sizes(org: OrgModel) -> np.ndarray:
+    """Number of employees in the subtree of every employee, itself included.
+
+    Children always have a greater depth than their parent, so sizes are
+    accumulated one level at a time from the deepest level up.
+
+    Args:
+        org (OrgModel): The org
+
+    Returns:
+        np.ndarray: Subtree size per employee index.
+    """
+    sizes = np.ones(len(org), dtype=np.int64)
+    for depth in range(int(org.depth.max()), 0, -1):
+        members = np.flatnonzero(org.depth == depth)
+        np.add.at(sizes, org.parent[members], sizes[members])
+    return sizes
+
+
+def build_org_chart(
+    org: OrgModel,
+    chart: Digraph,
+    root: int = 0,
+    max_nodes: int = 200,
+    sizes: np.ndarray | None = None,
+) -> None:
+    """Add the expanded portion of the org below `root` to a Graphviz chart.
+
+    Employees are added breadth first, keyed by their employee ID. Once the
+    direct reports of an employee no longer fit in `max_nodes`, they are
+    replaced by one summary node counting the collapsed subtree.
+
+    Args:
+        org (OrgModel): The org
+        chart (Digraph): Chart to add nodes and edges to
+        root (int): Index of the employee at the top of the chart
+        max_nodes (int): Most nodes, summaries included, in the chart
+        sizes (np.ndarray | None): Precomputed `subtree_sizes`
+    """
+    sizes = subtree_sizes(org) if sizes is None else sizes
+
+    def label(index: int) -> str:
+        designation = org.designations[org.designation[index]]
+        department = org.departments[org.department[index]]
+        return f"{designation}\n{department}"
+
+    chart.node(str(org.ids[root]), label(root))
+    # Every queued employee with reports reserves room for its summary node, so
+    # the chart never grows past `max_nodes` however the expansion ends
+    n_nodes = 1
+    reserved = int(org.child_count[root] > 0)
+    queue = deque([root] if reserved else [])
+    while queue:
+        index = queue.popleft()
+        employee_id = str(org.ids[index])
+        children = org.children(index)
+        managers = [child for child in children if org.child_count[child] > 0]
+        reserved -= 1
+
+        if n_nodes + len(children) + reserved + len(managers) <= max_nodes:
+            for child in children:
+                chart.node(str(org.ids[child]), label(child))
+                chart.edge(employee_id, str(org.ids[child]))
+            queue.extend(managers)
+            n_nodes += len(children)
+            reserved += len(managers)
+        else:
+            summary_id = f"{employee_id}-collapsed"
+            chart.node(
+                summary_id,
+                f"{len(children)} direct reports\n{int(sizes[index]) - 1} employees",
+                shape="box",
+                style="dashed",
+            )
+            chart.edge(employee_id, summary_id)
+            n_nodes += 1
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def render_org_chart(
+    fingerprint: str, _org: OrgModel, root: int = 0, max_nodes: int = 200
+) -> str:
+    """Lay out and render the org chart to SVG, memoized by org fingerprint.
+
+    Args:
+        fingerprint (str): `OrgModel.fingerprint` of `_org`
+        _org (OrgModel): The org, excluded from hashing
+        root (int): Index of the employee at the top of the chart
+        max_nodes (int): Most nodes, summaries included, in the chart
+
+    Returns:
+        str: SVG markup.
+    """
+    chart = Digraph(format="svg")
+    build_org_chart(_org, chart, root=root, max_nodes=max_nodes)
+    return chart.pipe(format="svg").decode("utf-8")
@@ -0,0 +1,349 @@
+"""Columnar org model.
+
+Employees are stored as parallel NumPy arrays (id, parent index, depth,
+designation, department) generated level by level with vectorized, seeded
+draws. Because every level is generated in parent order, the direct reports of
+an employee always occupy a contiguous index range, so the tree needs no
+per-employee Python objects. `OrgNode` exposes the nested dict shape the
+existing pages consume, built lazily from the arrays.
+"""
+
+from collections.abc import Iterator, Mapping
+from functools import cached_property
+from hashlib import sha256
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from polars import DataFrame, Series
+from pydantic import BaseModel, Field
+
+ID_ALPHABET = np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789", dtype=np.uint8)
+ID_LENGTH = 6
+EMAIL_DOMAINS = ["example.com", "company.com", "org.com"]
+
+
+class OrgLevel(BaseModel):
+    """One level of the org below its parent level."""
+
+    designations: list[str] = Field(
+        ..., description="Designations cycled over each parent's direct reports"
+    )
+    departments: list[str] | None = Field(
+        None,
+        description="Departments cycled over direct reports; inherited from the parent if None",
+    )
+    min_reports: int = Field(1, ge=0, description="Fewest direct reports per parent")
+    max_reports: int = Field(1, ge=0, description="Most direct reports per parent")
+    distribution: str = Field(
+        "uniform",
+        pattern="^(uniform|poisson)$",
+        description="Distribution of the number of direct reports per parent",
+    )
+
+
+def default_levels(num_managers: int, max_employees: int) -> list[OrgLevel]:
+    """Levels of the classic CEO -> executives -> managers -> employees org.
+
+    Args:
+        num_managers (int): Managers per executive
+        max_employees (int): Most employees per manager
+
+    Returns:
+        list[OrgLevel]: Levels below the CEO.
+    """
+    return [
+        OrgLevel(
+            designations=["CTO", "COO", "CFO"],
+            departments=["Technology", "Operations", "Finance"],
+            min_reports=3,
+            max_reports=3,
+        ),
+        OrgLevel(
+            designations=["Manager"], min_reports=num_managers, max_reports=num_managers
+        ),
+        OrgLevel(designations=["Employee"], min_reports=1, max_reports=max_employees),
+    ]
+
+
+def generate_ids(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Generate `n` distinct random 6-character employee IDs.
+
+    IDs are distinct integers drawn without replacement from the 36**6 ID space
+    and encoded in base 36 with array arithmetic.
+
+    Args:
+        n (int): Number of IDs
+        rng (np.random.Generator): Random generator
+
+    Returns:
+        np.ndarray: Unicode array of shape (n,).
+    """
+    values = rng.choice(len(ID_ALPHABET) ** ID_LENGTH, size=n, replace=False)
+    powers = len(ID_ALPHABET) ** np.arange(ID_LENGTH - 1, -1, -1, dtype=np.int64)
+    digits = (values[:, None] // powers) % len(ID_ALPHABET)
+    chars = np.ascontiguousarray(ID_ALPHABET[digits])
+    return chars.view(f"S{ID_LENGTH}").ravel().astype(f"U{ID_LENGTH}")
+
+
+def draw_reports(
+    level: OrgLevel, n_parents: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Draw the number of direct reports of every parent on a level."""
+    if level.distribution == "poisson":
+        mean = (level.min_reports + level.max_reports) / 2
+        counts = rng.poisson(mean, size=n_parents)
+        return np.clip(counts, level.min_reports, level.max_reports)
+    return rng.integers(level.min_reports, level.max_reports + 1, size=n_parents)
+
+
+class OrgModel:
+    """Array-backed org structure."""
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        parent: np.ndarray,
+        depth: np.ndarray,
+        designation: np.ndarray,
+        department: np.ndarray,
+        designations: list[str],
+        departments: list[str],
+        child_start: np.ndarray,
+        child_count: np.ndarray,
+    ) -> None:
+        """Initialize the org model from its parallel arrays."""
+        self.ids = ids
+        self.parent = parent
+        self.depth = depth
+        self.designation = designation
+        self.department = department
+        self.designations = designations
+        self.departments = departments
+        self.child_start = child_start
+        self.child_count = child_count
+
+    @classmethod
+    def generate(
+        cls,
+        levels: list[OrgLevel],
+        seed: int | None = None,
+        root_designation: str = "CEO",
+        root_department: str = "Executive",
+    ) -> "OrgModel":
+        """Generate an org of arbitrary depth level by level.
+
+        Args:
+            levels (list[OrgLevel]): Levels below the root, top to bottom
+            seed (int | None): Seed for the random generator
+            root_designation (str): Designation of the root employee
+            root_department (str): Department of the root employee
+
+        Returns:
+            OrgModel: The generated org.
+        """
+        rng = np.random.default_rng(seed)
+        designations = [root_designation]
+        departments = [root_department]
+        for level in levels:
+            designations += [d for d in level.designations if d not in designations]
+            departments += [d for d in level.departments or [] if d not in departments]
+
+        parent = [np.array([-1], dtype=np.int64)]
+        depth = [np.zeros(1, dtype=np.int32)]
+        designation = [np.zeros(1, dtype=np.int32)]
+        department = [np.zeros(1, dtype=np.int32)]
+        child_counts = []
+
+        level_start, level_size = 0, 1
+        for level_depth, level in enumerate(levels, start=1):
+            counts = draw_reports(level, level_size, rng)
+            child_counts.append(counts)
+            n_children = int(counts.sum())
+
+            parents = np.repeat(
+                np.arange(level_start, level_start + level_size), counts
+            )
+            rank = np.arange(n_children) - np.repeat(np.cumsum(counts) - counts, counts)
+
+            level_designations = np.array(
+                [designations.index(d) for d in level.designations], dtype=np.int32
+            )
+            if level.departments is None:
+                level_departments = department[-1][parents - level_start]
+            else:
+                codes = np.array(
+                    [departments.index(d) for d in level.departments], dtype=np.int32
+                )
+                level_departments = codes[rank % len(codes)]
+
+            parent.append(parents)
+            depth.append(np.full(n_children, level_depth, dtype=np.int32))
+            designation.append(level_designations[rank % len(level_designations)])
+            department.append(level_departments)
+
+            level_start, level_size = level_start + level_size, n_children
+
+        child_counts.append(np.zeros(level_size, dtype=np.int64))
+        child_count = np.concatenate(child_counts)
+        child_start = 1 + np.cumsum(child_count) - child_count
+
+        return cls(
+            ids=generate_ids(len(child_count), rng),
+            parent=np.concatenate(parent),
+            depth=np.concatenate(depth),
+            designation=np.concatenate(designation),
+            department=np.concatenate(department),
+            designations=designations,
+            departments=departments,
+            child_start=child_start,
+            child_count=child_count,
+        )
+
+    def save(self, path: Path) -> None:
+        """Persist the org arrays to a compressed `.npz` file.
+
+        Args:
+            path (Path): Destination file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as file:
+            np.savez_compressed(
+                file,
+                ids=self.ids,
+                parent=self.parent,
+                depth=self.depth,
+                designation=self.designation,
+                department=self.department,
+                designations=np.array(self.designations),
+                departments=np.array(self.departments),
+                child_start=self.child_start,
+                child_count=self.child_count,
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "OrgModel":
+        """Load an org saved with `save`.
+
+        Args:
+            path (Path): File written by `save`
+
+        Returns:
+            OrgModel: The loaded org.
+        """
+        with np.load(path) as arrays:
+            return cls(
+                ids=arrays["ids"],
+                parent=arrays["parent"],
+                depth=arrays["depth"],
+                designation=arrays["designation"],
+                department=arrays["department"],
+                designations=arrays["designations"].tolist(),
+                departments=arrays["departments"].tolist(),
+                child_start=arrays["child_start"],
+                child_count=arrays["child_count"],
+            )
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Hash of the org structure, used as a cache key for rendered views."""
+        digest = sha256()
+        for array in (self.ids, self.parent, self.designation, self.department):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()
+
+    def index_of(self, employee_id: str) -> int | None:
+        """Index of the employee with the given ID, or None if there is none."""
+        matches = np.flatnonzero(self.ids == employee_id)
+        return int(matches[0]) if len(matches) else None
+
+    def __len__(self) -> int:
+        """Number of employees in the org."""
+        return len(self.ids)
+
+    def children(self, index: int) -> range:
+        """Indices of the direct reports of an employee."""
+        start = int(self.child_start[index])
+        return range(start, start + int(self.child_count[index]))
+
+    def work_email(self, index: int) -> str:
+        """Work email of an employee, derived from designation and index."""
+        name = self.designations[self.designation[index]]
+        domain = EMAIL_DOMAINS[index % len(EMAIL_DOMAINS)]
+        return f"{name.lower().replace(' ', '.')}@{domain}"
+
+    def root(self) -> "OrgNode":
+        """Lazy nested dict view of the org rooted at the top employee."""
+        return OrgNode(self, 0)
+
+    def to_frame(self) -> DataFrame:
+        """Columnar view of the org as a polars (Arrow-backed) DataFrame."""
+        return DataFrame(
+            [
+                Series("id", self.ids),
+                Series("parent", self.parent),
+                Series("depth", self.depth),
+                Series("designation", np.array(self.designations)[self.designation]),
+                Series("department", np.array(self.departments)[self.department]),
+            ]
+        )
+
+
+class OrgNode(Mapping):
+    """Read-only dict view of one employee, built on access from an `OrgModel`.
+
+    Has the same keys as the dicts produced by `generate_employee`, with
+    `team_members` materialized only when it is read.
+    """
+
+    _keys = ("id", "designation", "department", "manager", "team_members")
+
+    def __init__(self, org: OrgModel, index: int) -> None:
+        """Initialize the view of employee `index`."""
+        self.org = org
+        self.index = index
+
+    def __getitem__(self, key: str) -> Any:
+        """Look up one field of the employee."""
+        org, index = self.org, self.index
+        if key == "id":
+            return str(org.ids[index])
+        if key == "designation":
+            return org.designations[org.designation[index]]
+        if key == "department":
+            return org.departments[org.department[index]]
+        if key == "manager":
+            parent = int(org.parent[index])
+            if parent < 0:
+                return None
+            return {
+                "id": str(org.ids[parent]),
+                "department": org.departments[org.department[parent]],
+                "workEmail": org.work_email(parent),
+            }
+        if key == "team_members":
+            return [OrgNode(org, child) for child in org.children(index)]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the field names."""
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        """Number of fields."""
+        return len(self._keys)
+
+    def to_dict(self) -> dict:
+        """Materialize this subtree as nested plain dicts, iteratively."""
+        root = {key: self[key] for key in self._keys if key != "team_members"}
+        root["team_members"] = []
+        stack = [(self.index, root)]
+        while stack:
+            index, node = stack.pop()
+            for child in self.org.children(index):
+                view = OrgNode(self.org, child)
+                member = {key: view[key] for key in self._keys if key != "team_members"}
+                member["team_members"] = []
+                node["team_members"].append(member)
+                stack.append((child, member))
+        return root
@@ -0,0 +1,77 @@
+"""Session-scoped store of generated orgs.
+
+Orgs are keyed by the generator inputs (num_managers, max_employees, seed), so
+every page in a session reuses the same `OrgModel` instead of regenerating it,
+and can optionally be persisted to disk so a new session loads rather than
+regenerates them.
+"""
+
+from pathlib import Path
+
+import streamlit as st
+
+from src.org_structure.org_model import OrgModel, OrgNode, default_levels
+
+ORG_CACHE_DIR = Path(".cache/org_structure")
+
+OrgKey = tuple[int, int, int]
+
+
+def _store() -> dict[OrgKey, OrgModel]:
+    if "org_store" not in st.session_state:
+        st.session_state.org_store = {}
+    return st.session_state.org_store
+
+
+def org_path(key: OrgKey, cache_dir: Path = ORG_CACHE_DIR) -> Path:
+    """Path of the persisted org for a key."""
+    num_managers, max_employees, seed = key
+    return cache_dir / f"org_{num_managers}_{max_employees}_{seed}.npz"
+
+
+def get_org(key: OrgKey, persist: bool = False) -> OrgModel:
+    """Return the org for a key, generating it only on first use.
+
+    Looks in the session store first, then on disk when `persist` is set, and
+    only generates a new org if neither has it.
+
+    Args:
+        key (OrgKey): (num_managers, max_employees, seed)
+        persist (bool): Whether to read and write the org on disk
+
+    Returns:
+        OrgModel: The org for the key.
+    """
+    store = _store()
+    if key in store:
+        return store[key]
+
+    path = org_path(key)
+    if persist and path.exists():
+        org = OrgModel.load(path)
+    else:
+        num_managers, max_employees, seed = key
+        org = OrgModel.generate(default_levels(num_managers, max_employees), seed=seed)
+        if persist:
+            org.save(path)
+
+    store[key] = org
+    return org
+
+
+def set_active_org(key: OrgKey) -> None:
+    """Select the org the other pages work on."""
+    st.session_state.active_org_key = key
+
+
+def active_org_key() -> OrgKey | None:
+    """Key of the selected org, or None if no org has been generated yet."""
+    return st.session_state.get("active_org_key")
+
+
+def active_org() -> OrgNode | None:
+    """Lazy dict view of the selected org, or None if none is selected."""
+    key = active_org_key()
+    if key is None or key not in _store():
+        return None
+    return _store()[key].root()
@@ -0,0 +1,228 @@
+"""Profiling mode for the Streamlit pages.
+
+Runs a page under cProfile and tracemalloc and collects the per-stage timings
+recorded by `src.logger` spans during that run. Nothing here is imported into
+the page call path unless profiling is switched on.
+
+cProfile only sees the script thread, while tracemalloc and the span totals
+are process-wide, so other sessions running at the same time are counted too.
+Work the page hands to the job queue runs on worker threads and is reported
+from each job's own spans instead.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from threading import Lock
+
+import streamlit as st
+from polars import DataFrame
+
+from src.jobs import get_queue, watch_jobs
+from src.logger import instrumentation
+
+LIMITS = (
+    "Function timings cover the page's script thread only. Peak memory and "
+    "stage timings are process-wide, so they include other sessions running "
+    "at the same time. Jobs run on worker threads; their own stages are "
+    "listed under Jobs once they finish."
+)
+
+# tracemalloc is process-wide; it runs while any session is profiling
+_tracing_lock = Lock()
+_tracing_sessions = 0
+
+
+def _start_tracing() -> None:
+    global _tracing_sessions
+    with _tracing_lock:
+        if _tracing_sessions == 0:
+            tracemalloc.start()
+        _tracing_sessions += 1
+
+
+def _stop_tracing() -> None:
+    global _tracing_sessions
+    with _tracing_lock:
+        _tracing_sessions -= 1
+        if _tracing_sessions == 0:
+            tracemalloc.stop()
+
+
+def _span_totals() -> dict[str, tuple[int, float]]:
+    return {
+        name: (instrumentation.calls[name], instrumentation.totals[name])
+        for name in list(instrumentation.totals)
+    }
+
+
+def _function_stats(profiler: cProfile.Profile, top_n: int) -> tuple[list[dict], bytes]:
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    functions = sorted(
+        (
+            {
+                "function": f"{Path(file).name}:{line}({func})",
+                "calls": n_calls,
+                "tottime_s": tottime,
+                "cumtime_s": cumtime,
+            }
+            for (file, line, func), (_, n_calls, tottime, cumtime, _) in (
+                stats.stats.items()  # type: ignore
+            )
+        ),
+        key=lambda row: row["cumtime_s"],
+        reverse=True,
+    )[:top_n]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dump = Path(tmp) / "page.prof"
+        stats.dump_stats(dump)
+        pstats_bytes = dump.read_bytes()
+    return functions, pstats_bytes
+
+
+def profile_run(run: Callable[[], None], top_n: int = 25) -> dict:
+    """Run a page under cProfile and tracemalloc.
+
+    Args:
+        run (Callable[[], None]): The page to run
+        top_n (int): Number of functions kept in the top-functions table
+
+    Returns:
+        dict: Wall time, peak traced memory, per-stage span timings, the jobs
+            the page showed with their own span timings, the top functions by
+            cumulative time and the raw pstats dump, or no functions and
+            pstats if another session was profiling at the same time.
+    """
+    spans_before = _span_totals()
+    profiler = cProfile.Profile()
+    _start_tracing()
+    start = time.perf_counter()
+    try:
+        with watch_jobs() as job_ids:
+            try:
+                profiler.enable()
+                profiled = True
+            except ValueError:
+                # From Python 3.12 only one cProfile runs per process at a time
+                profiled = False
+            try:
+                run()
+            finally:
+                if profiled:
+                    profiler.disable()
+        wall_s = time.perf_counter() - start
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        _stop_tracing()
+
+    stages = []
+    for name, (calls, total) in _span_totals().items():
+        calls_before, total_before = spans_before.get(name, (0, 0.0))
+        if calls > calls_before:
+            stages.append(
+                {
+                    "stage": name,
+                    "depth": name.count("/"),
+                    "calls": calls - calls_before,
+                    "seconds": total - total_before,
+                }
+            )
+    stages.sort(key=lambda stage: stage["stage"])
+
+    jobs = []
+    for job_id in dict.fromkeys(job_ids):
+        record = get_queue().get(job_id)
+        if record is None:
+            continue
+        # No spans while the job is still running or if an earlier server ran it
+        job_stages = sorted(record.spans.items()) or [(None, None)]
+        jobs.extend(
+            {
+                "job": f"{record.kind} {record.id}",
+                "status": record.status,
+                "stage": name,
+                "seconds": seconds,
+            }
+            for name, seconds in job_stages
+        )
+
+    functions, pstats_bytes = (
+        _function_stats(profiler, top_n) if profiled else ([], None)
+    )
+
+    return {
+        "wall_s": wall_s,
+        "peak_memory_mb": peak_bytes / 2**20,
+        "stages": stages,
+        "jobs": jobs,
+        "functions": functions,
+        "pstats": pstats_bytes,
+    }
+
+
+def flame_table(stages: list[dict], wall_s: float, width: int = 30) -> DataFrame:
+    """Lay out nested stage timings as an indented table with proportional bars."""
+    return DataFrame(
+        [
+            {
+                "stage": "  " * stage["depth"] + stage["stage"].split("/")[-1],
+                "calls": stage["calls"],
+                "seconds": round(stage["seconds"], 4),
+                "share": "█" * max(round(width * stage["seconds"] / wall_s), 0),
+            }
+            for stage in stages
+        ],
+        schema={"stage": str, "calls": int, "seconds": float, "share": str},
+    )
+
+
+def show_profile(report: dict) -> None:
+    """Show a profiling report in an expander with download buttons."""
+    with st.expander("Profile", expanded=True):
+        st.write(
+            f"Wall time: {report['wall_s']:.3f}s, "
+            f"peak traced memory: {report['peak_memory_mb']:.1f} MiB"
+        )
+        st.caption(LIMITS)
+        st.subheader("Stages")
+        st.dataframe(flame_table(report["stages"], report["wall_s"]))
+        if report["jobs"]:
+            st.subheader("Jobs")
+            st.dataframe(
+                DataFrame(
+                    report["jobs"],
+                    schema={
+                        "job": str,
+                        "status": str,
+                        "stage": str,
+                        "seconds": float,
+                    },
+                )
+            )
+        st.subheader("Top functions by cumulative time")
+        if report["pstats"] is None:
+            st.info("Another session was profiling, so functions were not timed.")
+        else:
+            st.dataframe(DataFrame(report["functions"]))
+
+        summary = {key: value for key, value in report.items() if key != "pstats"}
+        st.download_button(
+            "Download report (JSON)",
+            data=json.dumps(summary, indent=2),
+            file_name="profile.json",
+            mime="application/json",
+        )
+        if report["pstats"] is not None:
+            st.download_button(
+                "Download cProfile stats",
+                data=report["pstats"],
+                file_name="page.prof",
+                mime="application/octet-stream",
+            )
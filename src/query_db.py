@@ -5,6 +5,7 @@ from pathlib import PosixPath
 from polars import DataFrame
 
 from src.duck import DBDuck
+from src.logger import increment, span
 
 
 def execute_query(
@@ -24,9 +25,13 @@ def execute_query(
         if isinstance(data, DataFrame):
             quack.register("data", data)
 
+        name = query.name if isinstance(query, PosixPath) else "inline"
         query = query.read_text() if isinstance(query, PosixPath) else query
 
-        return DataFrame(
-            quack.execute(query, params).fetch_arrow_table(),
-            orient="row",
-        )
+        with span(f"duckdb:{name}"):
+            result = DataFrame(
+                quack.execute(query, params).fetch_arrow_table(),
+                orient="row",
+            )
+        increment("duckdb_rows_returned", len(result))
+        return result
@@ -1,5 +1,3 @@
-from os import environ
-
 from dotenv import load_dotenv
 from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings
@@ -20,7 +18,7 @@ class DBSettings(BaseSettings):
     ENABLE_PROGRESS_BAR: bool = Field(
         True, description="Whether to enable progress bar for duckdb"
     )
-    HST: str = Field(environ["HST"], description="Host for the database")
-    USR: str = Field(environ["USR"], description="User for the database")
-    PWD: SecretStr = Field(environ["PWD"], description="Password for the database")
-    DB: str = Field(environ["DB"], description="Database name")
+    HST: str = Field(..., description="Host for the database")
+    USR: str = Field(..., description="User for the database")
+    PWD: SecretStr = Field(..., description="Password for the database")
+    DB: str = Field(..., description="Database name")
@@ -0,0 +1,20 @@
+"""Sets schemas for the LLM client"""
+
+from pydantic import Field, SecretStr
+from pydantic_settings import BaseSettings
+
+
+class LLMSettings(BaseSettings):
+    """LLM settings"""
+
+    OPENAI_API_KEY: SecretStr = Field(
+        ..., title="OpenAI API Key", description="API key for OpenAI"
+    )
+
+    class Config:
+        """LLM settings config"""
+
+        env_file = ".env"
+        extra = "ignore"
+        title = "LLM Settings"
+        description = "Settings for the ticket generation LLM client"
@@ -1,22 +1,54 @@
 """Sets schemas for embeddings model"""
 
-from os import environ
+from pathlib import Path
+from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import Field, model_validator
+from pydantic_settings import BaseSettings
 
 
-class ModelSettings(BaseModel):
+class ModelSettings(BaseSettings):
     """Model settings"""
 
     MODEL_VERSION: str = Field(
-        environ["MODEL_VERSION"],
+        ...,
         title="Model",
         description="Pre-trained word embeddings model",
     )
+    TITLE_WEIGHT: float = Field(
+        0.7,
+        ge=0,
+        title="Title Weight",
+        description="Weight of the title embedding in the fused hybrid vector",
+    )
+    DESCRIPTION_WEIGHT: float = Field(
+        0.3,
+        ge=0,
+        title="Description Weight",
+        description="Weight of the description embedding in the fused hybrid vector",
+    )
+    INFERENCE_BACKEND: Literal["torch", "int8", "onnx"] = Field(
+        "torch",
+        title="Inference Backend",
+        description="fp32 torch, int8 dynamically quantized torch or onnxruntime",
+    )
+    MODEL_CACHE_DIR: Path = Field(
+        Path(".cache/models"),
+        title="Model Cache Directory",
+        description="Where models converted for the int8 and onnx backends are kept",
+    )
+
+    @model_validator(mode="after")
+    def check_weights(self) -> "ModelSettings":
+        """Require a nonzero total weight, which the fused vector is divided by."""
+        if self.TITLE_WEIGHT + self.DESCRIPTION_WEIGHT <= 0:
+            raise ValueError("TITLE_WEIGHT and DESCRIPTION_WEIGHT cannot both be 0")
+        return self
 
     class Config:
         """Model settings config"""
 
         env_file = ".env"
+        extra = "ignore"
         title = "Model Settings"
         description = "Settings for the embeddings model"
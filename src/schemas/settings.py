@@ -0,0 +1,40 @@
+"""Single, lazily validated settings instance for the app."""
+
+from functools import cached_property
+
+from src.schemas.db_settings import DBSettings
+from src.schemas.llm import LLMSettings
+from src.schemas.model import ModelSettings
+from src.schemas.sql import SQLModel
+
+
+class Settings:
+    """Application settings.
+
+    Each section is read from the environment and validated the first time it
+    is accessed and then reused, so pages that never touch the database or the
+    LLM do not require their variables to be set.
+    """
+
+    @cached_property
+    def model(self) -> ModelSettings:
+        """Embeddings model settings."""
+        return ModelSettings()  # type: ignore
+
+    @cached_property
+    def db(self) -> DBSettings:
+        """Database settings."""
+        return DBSettings()  # type: ignore
+
+    @cached_property
+    def sql(self) -> SQLModel:
+        """SQL query locations."""
+        return SQLModel()  # type: ignore
+
+    @cached_property
+    def llm(self) -> LLMSettings:
+        """LLM client settings."""
+        return LLMSettings()  # type: ignore
+
+
+settings = Settings()
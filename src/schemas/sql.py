@@ -1,24 +1,24 @@
 """Schemas for accessing data from the database."""
 
-from os import environ
-from pathlib import Path, PosixPath
+from pathlib import PosixPath
 
-from pydantic import BaseModel, Field
+from pydantic import Field
+from pydantic_settings import BaseSettings
 
 
-class SQLModel(BaseModel):
+class SQLModel(BaseSettings):
     """SQL Model"""
 
     ONET_QUERY: PosixPath = Field(
-        Path(environ["ONET_QUERY"]),
+        ...,
         title="ONET Query",
         description="Query that retrieves data from the ONET database",
     )
 
     EMBEDS_QUERY: PosixPath = Field(
-        Path(environ["EMBEDS_QUERY"]),
+        ...,
         title="Embeddings Query",
-        description="Query that writes embeddings data to duckdb table.",
+        description="Query selecting the embeddings data written to each model's duckdb table.",
     )
 
     ### read in the .env file
@@ -26,5 +26,6 @@ class SQLModel(BaseModel):
         """SQL Model config"""
 
         env_file = ".env"
+        extra = "ignore"
         title = "SQL Settings"
         description = "Settings for the SQL model"
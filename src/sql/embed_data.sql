@@ -1,7 +1,8 @@
--- Creates a table out of the onet data that adds title and description embeddings to
--- the onet data. This is done by joining the onet data with the embeddings table on the
--- index column.
-CREATE OR REPLACE TABLE onet_with_embeddings AS
+-- Selects the onet data with its title and description embeddings. The pipeline writes
+-- the result to the table of its model version (see src/embeddings/versions.py), so
+-- each model's embeddings are kept side by side. FUSED_EMBEDDINGS is the weighted,
+-- normalized title and description vector used for hybrid search; its weights and the
+-- inference backend that produced the embeddings are recorded next to MODEL_VERSION.
 SELECT
     data.index AS ONET_INDEX,
     data.titles AS ONET_TITLES,
@@ -10,6 +11,9 @@ SELECT
     data.median_salary AS MEDIAN_SALARY,
     data.titles_embeddings AS TITLE_EMBEDDINGS,
     data.descriptions_embeddings AS DESCRIPTION_EMBEDDINGS,
-	$model_version AS MODEL_VERSION
+    data.fused_embeddings AS FUSED_EMBEDDINGS,
+	$model_version AS MODEL_VERSION,
+	$title_weight AS TITLE_WEIGHT,
+	$description_weight AS DESCRIPTION_WEIGHT,
+	$inference_backend AS INFERENCE_BACKEND
 FROM data
-
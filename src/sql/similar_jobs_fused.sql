@@ -0,0 +1,19 @@
+-- Finds the five ONET jobs closest to the entered job title by title and description
+-- in one scan of the fused vectors built at ingestion. Expects the entered job and its
+-- embedding registered as j_embeds.
+WITH job_embeds_cte AS (
+    SELECT jobtitle, jobtitle_embeddings
+    FROM j_embeds
+)
+SELECT
+    job_embeds_cte.jobtitle AS entered_job,
+    onet.ONET_ONETSOC_CODE,
+    onet.ONET_TITLES AS similar_job,
+    list_cosine_similarity(job_embeds_cte.jobtitle_embeddings, onet.FUSED_EMBEDDINGS) AS similarity,
+    onet.MEDIAN_SALARY AS median_salary
+FROM
+    job_embeds_cte
+    CROSS JOIN onet_with_embeddings AS onet
+ORDER BY similarity DESC
+LIMIT 5
+;
@@ -0,0 +1,44 @@
+-- Re-ranks the $candidates ONET jobs closest to the entered job title on the fused
+-- vectors by the weighted sum of their separate title and description similarities,
+-- with weights $title_weight and $description_weight chosen at query time. Expects the
+-- entered job and its embedding registered as j_embeds.
+WITH job_embeds_cte AS (
+    SELECT jobtitle, jobtitle_embeddings
+    FROM j_embeds
+),
+candidates AS (
+    SELECT
+        job_embeds_cte.jobtitle AS entered_job,
+        job_embeds_cte.jobtitle_embeddings,
+        onet.ONET_ONETSOC_CODE,
+        onet.ONET_TITLES,
+        onet.MEDIAN_SALARY,
+        onet.TITLE_EMBEDDINGS,
+        onet.DESCRIPTION_EMBEDDINGS,
+        list_cosine_similarity(job_embeds_cte.jobtitle_embeddings, onet.FUSED_EMBEDDINGS) AS fused_similarity
+    FROM
+        job_embeds_cte
+        CROSS JOIN onet_with_embeddings AS onet
+    ORDER BY fused_similarity DESC
+    LIMIT $candidates
+),
+scores AS (
+    SELECT
+        *,
+        list_cosine_similarity(jobtitle_embeddings, TITLE_EMBEDDINGS) AS title_similarity,
+        list_cosine_similarity(jobtitle_embeddings, DESCRIPTION_EMBEDDINGS) AS description_similarity
+    FROM candidates
+)
+SELECT
+    entered_job,
+    ONET_ONETSOC_CODE,
+    ONET_TITLES AS similar_job,
+    ($title_weight * title_similarity + $description_weight * description_similarity)
+        / ($title_weight + $description_weight) AS similarity,
+    title_similarity,
+    description_similarity,
+    MEDIAN_SALARY AS median_salary
+FROM scores
+ORDER BY similarity DESC
+LIMIT 5
+;
@@ -1,17 +1,53 @@
 import asyncio
 import random
 import string
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 from enum import Enum
-from os import environ
+from pathlib import Path
+from threading import Event, Lock
+from weakref import WeakKeyDictionary
 
 import instructor
 import streamlit as st  # type: ignore
 from openai import AsyncOpenAI
-from polars import DataFrame
+from polars import DataFrame, read_parquet
 from pydantic import BaseModel, Field
 
-client = instructor.from_openai(AsyncOpenAI(api_key=environ["OPENAI_API_KEY"]))
+from src.jobs import check_cancelled, get_queue, show_job
+from src.json_view import paged_rows
+from src.logger import increment, span
+from src.org_structure.org_model import OrgNode
+from src.schemas.settings import settings
+
+TICKETS_CACHE_DIR = Path(".cache/tickets")
+
+
+# One client per event loop, since its pooled connections belong to the loop
+# that opened them and ticket jobs each run their own loop on a worker thread
+_clients: WeakKeyDictionary[asyncio.AbstractEventLoop, instructor.AsyncInstructor] = (
+    WeakKeyDictionary()
+)
+_clients_lock = Lock()
+
+
+def get_client() -> instructor.AsyncInstructor:
+    """Create the running event loop's instructor-patched OpenAI client on first use."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        if loop not in _clients:
+            _clients[loop] = instructor.from_openai(
+                AsyncOpenAI(api_key=settings.llm.OPENAI_API_KEY.get_secret_value())
+            )
+        return _clients[loop]
+
+
+async def close_client() -> None:
+    """Close the running event loop's client, if it created one."""
+    with _clients_lock:
+        client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.client.close()
 
 
 # Utility functions
@@ -80,46 +116,63 @@ class Ticket(BaseModel):
     custom_mappings: dict = Field(default_factory=dict)
 
 
-async def create_ticket_with_prompt(employee: dict) -> Ticket:
+async def create_ticket_with_prompt(employee: Mapping) -> Ticket:
     """Generate ticket details using an AI model with a descriptive prompt."""
     prompt = f"""
-                Create a detailed Jira ticket for an employee in the role of {employee['designation']}.
+                Create a detailed Jira ticket for an employee in the role of {employee["designation"]}.
                 Include a description of the problem, suggested initial steps for troubleshooting,
                 expected impacts on the project timeline, and any urgent resources or support needed.
                 Specify the urgency and assign a priority based on the severity of the issue.
               """
 
-    return await client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        response_model=Ticket,
-        messages=[{"role": "user", "content": prompt}],
-    )
+    with span("llm_ticket"):
+        ticket, completion = await get_client().chat.completions.create_with_completion(
+            model="gpt-3.5-turbo",
+            response_model=Ticket,
+            messages=[{"role": "user", "content": prompt}],
+        )
+    if completion.usage is not None:
+        increment("llm_prompt_tokens", completion.usage.prompt_tokens)
+        increment("llm_completion_tokens", completion.usage.completion_tokens)
+    return ticket
+
+
+def ticket_row(employee: Mapping, ticket: Ticket) -> dict:
+    """Flatten a generated ticket and its employee into one tickets row."""
+    return {
+        "user_id": employee["id"],
+        "ticket_id": ticket.id,
+        "assignee_id": ticket.assignees[0].id,
+        "assignee_username": ticket.assignees[0].username,
+        "ticket_type": ticket.type,
+        "ticket_status": ticket.status,
+        "ticket_priority": ticket.priority,
+        "description": ticket.description,
+        "created_at": ticket.created_at,
+        "due_date": ticket.due_date,
+        "completed_at": ticket.completed_at,
+        "designation": employee["designation"],
+        "department": employee["department"],
+    }
+
+
+def tickets_path(fingerprint: str, cache_dir: Path = TICKETS_CACHE_DIR) -> Path:
+    """Path of the tickets precomputed by the batch CLI for an org fingerprint."""
+    return cache_dir / fingerprint / "tickets.parquet"
 
 
 # Async task management and Streamlit UI integration
-async def generate_tickets_for_organization(org_structure: dict) -> DataFrame:
+async def generate_tickets_for_organization(
+    org_structure: Mapping, cancelled: Event | None = None
+) -> DataFrame:
     tickets_data = []
 
-    async def traverse_org(employee: dict) -> None:
+    async def traverse_org(employee: Mapping) -> None:
+        if cancelled is not None:
+            check_cancelled(cancelled)
         if employee["designation"] != "CEO":
             ticket: Ticket = await create_ticket_with_prompt(employee)
-            tickets_data.append(
-                {
-                    "user_id": employee["id"],
-                    "ticket_id": ticket.id,
-                    "assignee_id": ticket.assignees[0].id,
-                    "assignee_username": ticket.assignees[0].username,
-                    "ticket_type": ticket.type,
-                    "ticket_status": ticket.status,
-                    "ticket_priority": ticket.priority,
-                    "description": ticket.description,
-                    "created_at": ticket.created_at,
-                    "due_date": ticket.due_date,
-                    "completed_at": ticket.completed_at,
-                    "designation": employee["designation"],
-                    "department": employee["department"],
-                }
-            )
+            tickets_data.append(ticket_row(employee, ticket))
         for team_member in employee.get("team_members", []):
             await traverse_org(team_member)
 
@@ -127,8 +180,32 @@ async def generate_tickets_for_organization(org_structure: dict) -> DataFrame:
     return DataFrame(tickets_data)
 
 
+def tickets_job(cancelled: Event, org_structure: OrgNode) -> DataFrame:
+    """Load an org's precomputed tickets, or generate them, as a job.
+
+    Args:
+        cancelled (Event): Set when the job is cancelled
+        org_structure (OrgNode): Root of the org
+
+    Returns:
+        DataFrame: One ticket per employee
+    """
+    # Prefer tickets precomputed by `python -m src.cli tickets`
+    path = tickets_path(org_structure.org.fingerprint)
+    if path.exists():
+        return read_parquet(path)
+
+    async def generate() -> DataFrame:
+        try:
+            return await generate_tickets_for_organization(org_structure, cancelled)
+        finally:
+            await close_client()
+
+    return asyncio.run(generate())
+
+
 def generate_api_response(tickets: DataFrame) -> dict:
-    data = tickets.to_dict()
+    data = tickets.to_dicts()
     return {
         "status_code": 200,
         "status": "OK",
@@ -152,13 +229,30 @@ def generate_api_response(tickets: DataFrame) -> dict:
     }
 
 
-def generate_tickets_page(org_structure: dict) -> DataFrame | None:
+def generate_tickets_page(org_structure: OrgNode) -> DataFrame | None:
     if len(org_structure) == 0:
         return None
     else:
-        tickets = asyncio.run(generate_tickets_for_organization(org_structure))
-        st.dataframe(tickets)
-        api_response = generate_api_response(tickets)
+        # Tickets are generated once per org on the shared job queue and reused
+        # across page switches. Orgs generated with different inputs can share
+        # a root ID, so they are told apart by their structure instead.
+        if "tickets_by_org" not in st.session_state:
+            st.session_state.tickets_by_org = {}
+        org_key = org_structure.org.fingerprint
+        if org_key not in st.session_state.tickets_by_org:
+            queue = get_queue()
+            job = queue.submit("tickets", {"org": org_key}, tickets_job, org_structure)
+            show_job(job)
+            tickets = queue.result(job)
+            if tickets is None:
+                return None
+            st.session_state.tickets_by_org[org_key] = tickets
+        tickets = st.session_state.tickets_by_org[org_key]
+        # Only the selected page of tickets is sent to the table and serialized
+        # into the API response
+        page = paged_rows(tickets, key="tickets_page")
+        st.dataframe(page)
+        api_response = generate_api_response(page)
         with st.container():
             st.json(api_response)
 